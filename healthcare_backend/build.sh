@@ -11,5 +11,8 @@ pip install -r requirements_production.txt
 # Collect static files
 python manage.py collectstatic --no-input
 
+# Precompute the OpenAPI schema served by /swagger.json, /swagger/ and /redoc/
+python manage.py generate_schema
+
 # Apply migrations
 python manage.py migrate
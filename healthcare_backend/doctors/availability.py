@@ -0,0 +1,112 @@
+import re
+
+DAY_NAMES = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+DAY_GROUPS = {
+    'daily': range(7), 'everyday': range(7), 'weekdays': range(5), 'weekends': range(5, 7),
+}
+MINUTES_PER_DAY = 24 * 60
+
+_DAY = r'(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?'
+_DAYS = rf'(?:daily|everyday|weekdays|weekends|{_DAY}(?:\s*(?:-|–|to)\s*{_DAY})?(?:\s*(?:,|&|and)\s*{_DAY}(?:\s*(?:-|–|to)\s*{_DAY})?)*)'
+_TIME = r'\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm)?'
+SLOT_PATTERN = re.compile(rf'({_DAYS})\s*:?\s*({_TIME})\s*(?:-|–|to)\s*({_TIME})', re.IGNORECASE)
+TIME_PATTERN = re.compile(r'^(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm)?$', re.IGNORECASE)
+
+
+def parse_day(value):
+    """Weekday number (Monday is 0) for `tue`, `Tuesday`, ...; None if unknown"""
+    prefix = value.strip().lower()[:3]
+    return DAY_NAMES.index(prefix) if prefix in DAY_NAMES else None
+
+
+def _parse_days(text):
+    text = text.lower()
+    if text in DAY_GROUPS:
+        return list(DAY_GROUPS[text])
+    days = []
+    for part in re.split(r'\s*(?:,|&|\band\b)\s*', text):
+        ends = [parse_day(end) for end in re.split(r'\s*(?:-|–|\bto\b)\s*', part)]
+        first, last = ends[0], ends[-1]
+        # Ranges wrap around the week, so Fri-Mon is Fri, Sat, Sun, Mon
+        days.extend((first + offset) % 7 for offset in range((last - first) % 7 + 1))
+    return days
+
+
+def _clock(text):
+    match = TIME_PATTERN.match(text.strip())
+    if match is None:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), (match.group(3) or '').lower()
+    return hour, minute, meridiem
+
+
+def _to_minutes(hour, minute, meridiem):
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+    if hour > 24 or minute > 59 or (hour == 24 and minute):
+        return None
+    return hour * 60 + minute
+
+
+def parse_time(text):
+    """Minutes after midnight for `10AM`, `9:30 pm` or `14:00`; None if unparseable"""
+    clock = _clock(text)
+    return _to_minutes(*clock) if clock else None
+
+
+def _parse_range(start_text, end_text):
+    start, end = _clock(start_text), _clock(end_text)
+    if start is None or end is None:
+        return None
+    if not start[2] and end[2]:
+        # "9-11AM" shares the meridiem unless that would end before it starts ("10-2PM")
+        same = _to_minutes(start[0], start[1], end[2])
+        start = (*start[:2], end[2] if same is not None and same < _to_minutes(*end) else 'am')
+    twelve_hour = (not start[2] and not end[2] and end[0] < start[0] <= 12
+                   and not end_text.strip().startswith('0'))
+    start, end = _to_minutes(*start), _to_minutes(*end)
+    if twelve_hour and end is not None:
+        # "9-5" is office hours, not an overnight shift
+        end += 12 * 60
+    if start is None or end is None or start == end:
+        return None
+    # 12AM as an end time means midnight at the end of the day
+    return start, end or MINUTES_PER_DAY
+
+
+def parse_availability(text):
+    """Turn free-form availability into sorted (weekday, start minute, end minute) slots.
+
+    Understands day names, ranges and lists (`Mon-Fri`, `Mon, Wed & Fri`,
+    `weekdays`, `daily`) followed by a time range (`9AM-5PM`, `09:00-17:00`),
+    repeated for several segments. Overnight ranges are split at midnight.
+    Text that matches nothing yields no slots.
+    """
+    slots = set()
+    for days_text, start_text, end_text in SLOT_PATTERN.findall(text or ''):
+        hours = _parse_range(start_text, end_text)
+        if hours is None:
+            continue
+        start, end = hours
+        for day in _parse_days(days_text):
+            if start < end:
+                slots.add((day, start, end))
+            else:
+                slots.add((day, start, MINUTES_PER_DAY))
+                if end:
+                    slots.add(((day + 1) % 7, 0, end))
+    return sorted(slots)
+
+
+def sync_availability(schedules):
+    """Store the slots of every availability text in `schedules` that is not stored yet"""
+    from .models import AvailabilitySlot
+
+    # One idempotent INSERT; texts already parsed hit the unique constraint and are skipped
+    AvailabilitySlot.objects.bulk_create([
+        AvailabilitySlot(schedule=schedule, weekday=day, start_minute=start, end_minute=end)
+        for schedule in set(schedules)
+        for day, start, end in parse_availability(schedule)
+    ], ignore_conflicts=True)
@@ -0,0 +1,46 @@
+import hashlib
+import uuid
+from django.core.cache import caches
+
+CACHE_ALIAS = 'doctors'
+GENERATION_KEY = 'doctors:generation'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_generation():
+    """Return the current directory generation, creating one if it is missing"""
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """Invalidate every cached doctor payload in O(1).
+
+    Entries are keyed by generation, so swapping the token orphans them all;
+    they age out through the backend's LRU eviction or timeout. A random token
+    (rather than an incrementing int) stays safe if the key itself is evicted.
+    """
+    get_cache().set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def make_key(kind, identifier):
+    digest = hashlib.md5(str(identifier).encode()).hexdigest()
+    return f'doctors:{get_generation()}:{kind}:{digest}'
+
+
+def get_or_set(kind, identifier, compute):
+    """Read-through lookup: return the cached payload or compute and store it"""
+    cache = get_cache()
+    key = make_key(kind, identifier)
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data)
+    return data
@@ -0,0 +1,98 @@
+from decimal import Decimal, InvalidOperation
+from django.db.models import Count, Exists, OuterRef
+from drf_yasg import openapi
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from .availability import parse_day, parse_time
+from .models import AvailabilitySlot
+
+FILTER_PARAMETERS = [
+    openapi.Parameter('specialization', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                      description='Exact specialization; comma-separate several'),
+    openapi.Parameter('min_fee', openapi.IN_QUERY, type=openapi.TYPE_NUMBER),
+    openapi.Parameter('max_fee', openapi.IN_QUERY, type=openapi.TYPE_NUMBER),
+    openapi.Parameter('min_experience', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+    openapi.Parameter('available_on', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                      description='Weekday, e.g. `tue`'),
+    openapi.Parameter('available_at', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                      description='Time of day, e.g. `10AM` or `14:30`; needs available_on'),
+]
+
+
+def _decimal(value):
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        raise ValueError
+    if not value.is_finite():
+        raise ValueError
+    return value
+
+
+def _clean(params):
+    """Validated {name: value} for the filters present in `params`"""
+    parsers = {
+        'specialization': lambda value: [item.strip() for item in value.split(',') if item.strip()],
+        'min_fee': _decimal,
+        'max_fee': _decimal,
+        'min_experience': int,
+        'available_on': parse_day,
+        'available_at': parse_time,
+    }
+    cleaned, errors = {}, {}
+    for name, parse in parsers.items():
+        if name not in params:
+            continue
+        try:
+            value = parse(params[name])
+        except ValueError:
+            value = None
+        if value is None or value == []:
+            errors[name] = [f'Invalid value "{params[name]}".']
+        else:
+            cleaned[name] = value
+    if 'available_at' in cleaned and 'available_on' not in cleaned:
+        errors.setdefault('available_at', ['available_on is required with available_at.'])
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+
+def filter_doctors(queryset, params, exclude=()):
+    """Apply the directory filters in `params` (query parameters) to a Doctor queryset"""
+    filters = {name: value for name, value in _clean(params).items() if name not in exclude}
+    if 'specialization' in filters:
+        queryset = queryset.filter(specialization__in=filters['specialization'])
+    if 'min_fee' in filters:
+        queryset = queryset.filter(consultation_fee__gte=filters['min_fee'])
+    if 'max_fee' in filters:
+        queryset = queryset.filter(consultation_fee__lte=filters['max_fee'])
+    if 'min_experience' in filters:
+        queryset = queryset.filter(experience_years__gte=filters['min_experience'])
+    if 'available_on' in filters:
+        slots = AvailabilitySlot.objects.filter(schedule=OuterRef('availability'), weekday=filters['available_on'])
+        if 'available_at' in filters:
+            slots = slots.filter(
+                start_minute__lte=filters['available_at'], end_minute__gt=filters['available_at']
+            )
+        queryset = queryset.filter(Exists(slots))
+    return queryset
+
+
+def specialization_facets(queryset, params):
+    """Doctor counts per specialization in one GROUP BY, under every filter but specialization"""
+    rows = (
+        filter_doctors(queryset, params, exclude=('specialization',))
+        .order_by()
+        .values('specialization')
+        .annotate(count=Count('pk'))
+        .order_by('-count', 'specialization')
+    )
+    return [{'value': row['specialization'], 'count': row['count']} for row in rows]
+
+
+class DoctorFilterBackend(BaseFilterBackend):
+    """Directory filters: specialization, fee range, minimum experience and availability"""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_doctors(queryset, request.query_params)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:31
+
+import django.contrib.postgres.search
+import healthcare_backend.search
+from healthcare_backend.migration_operations import RunSQLOnPostgres
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0003_doctor_active_patient_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doctor',
+            name='search_document',
+            field=models.GeneratedField(db_persist=True, expression=healthcare_backend.search.SearchDocument('name', 'specialization'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        # Full-text and trigram (typo-tolerant) matching for /search/
+        RunSQLOnPostgres(
+            sql=[
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+                "CREATE INDEX doctor_search_document_idx ON doctors_doctor USING gin (search_document);",
+                "CREATE INDEX doctor_name_trgm_idx ON doctors_doctor USING gin (name gin_trgm_ops);",
+                "CREATE INDEX doctor_specialization_trgm_idx ON doctors_doctor USING gin (specialization gin_trgm_ops);",
+            ],
+            reverse_sql=[
+                "DROP INDEX IF EXISTS doctor_search_document_idx;",
+                "DROP INDEX IF EXISTS doctor_name_trgm_idx;",
+                "DROP INDEX IF EXISTS doctor_specialization_trgm_idx;",
+            ],
+        ),
+    ]
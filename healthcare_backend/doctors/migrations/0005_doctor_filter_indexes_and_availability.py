@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:37
+
+from django.db import migrations, models
+from doctors.availability import parse_availability
+
+
+def backfill_slots(apps, schema_editor):
+    Doctor = apps.get_model('doctors', 'Doctor')
+    AvailabilitySlot = apps.get_model('doctors', 'AvailabilitySlot')
+    schedules = Doctor.objects.order_by().values_list('availability', flat=True).distinct()
+    AvailabilitySlot.objects.bulk_create([
+        AvailabilitySlot(schedule=schedule, weekday=day, start_minute=start, end_minute=end)
+        for schedule in schedules.iterator()
+        for day, start, end in parse_availability(schedule)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0004_doctor_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilitySlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schedule', models.CharField(max_length=200)),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_minute', models.PositiveSmallIntegerField()),
+                ('end_minute', models.PositiveSmallIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['specialization', 'name', 'id'], name='doctor_specialization_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['consultation_fee'], name='doctor_fee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['experience_years'], name='doctor_experience_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['availability'], name='doctor_availability_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='availabilityslot',
+            index=models.Index(fields=['weekday', 'start_minute', 'end_minute', 'schedule'], name='availability_slot_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='availabilityslot',
+            constraint=models.UniqueConstraint(fields=('schedule', 'weekday', 'start_minute', 'end_minute'), name='availability_slot_unique'),
+        ),
+        migrations.RunPython(backfill_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0005_doctor_filter_indexes_and_availability'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['updated_at', 'id'], name='doctor_updated_idx'),
+        ),
+    ]
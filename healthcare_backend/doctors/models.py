@@ -1,4 +1,6 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from healthcare_backend.search import SearchDocument
 
 class Doctor(models.Model):
     # Doctor basic information
@@ -21,12 +23,63 @@ class Doctor(models.Model):
         help_text="e.g., Mon-Fri 9AM-5PM"
     )
     
+    # Maintained by mappings.counters; repair with `manage.py reconcile_mapping_counts`
+    active_patient_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Full-text document for /search/ (GIN-indexed on PostgreSQL)
+    search_document = models.GeneratedField(
+        expression=SearchDocument('name', 'specialization'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Directory listing is keyset-paginated on (name, id)
+            models.Index(fields=['name', 'id'], name='doctor_name_idx'),
+            # ?specialization= keeps the (name, id) keyset order; also serves the facet GROUP BY
+            models.Index(fields=['specialization', 'name', 'id'], name='doctor_specialization_idx'),
+            models.Index(fields=['consultation_fee'], name='doctor_fee_idx'),
+            models.Index(fields=['experience_years'], name='doctor_experience_idx'),
+            # Joins doctors to the availability slots of their schedule
+            models.Index(fields=['availability'], name='doctor_availability_idx'),
+            # Delta sync reads changed rows keyset on (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='doctor_updated_idx'),
+        ]
     
     def __str__(self):
-        return f"Dr. {self.name} - {self.specialization}"
\ No newline at end of file
+        return f"Dr. {self.name} - {self.specialization}"
+
+
+class AvailabilitySlot(models.Model):
+    """One weekly slot parsed from an availability text; doctors sharing the text share the slots"""
+    WEEKDAYS = [(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'),
+                (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')]
+
+    # Joined to Doctor.availability, so a schedule is parsed and stored once however many use it
+    schedule = models.CharField(max_length=200)
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAYS)
+    # Minutes after midnight, end exclusive (1440 = midnight)
+    start_minute = models.PositiveSmallIntegerField()
+    end_minute = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['schedule', 'weekday', 'start_minute', 'end_minute'], name='availability_slot_unique'
+            ),
+        ]
+        indexes = [
+            # "Available Tuesday 10AM" is a range probe on (weekday, start) that never reads the table
+            models.Index(
+                fields=['weekday', 'start_minute', 'end_minute', 'schedule'], name='availability_slot_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.schedule}: {self.get_weekday_display()} {self.start_minute}-{self.end_minute}"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Doctor
+from healthcare_backend.fast_serializers import FastSerializer
 
 class DoctorSerializer(serializers.ModelSerializer):
     
@@ -8,9 +9,10 @@ class DoctorSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'email', 'phone', 'specialization', 
             'license_number', 'experience_years', 'address', 
-            'consultation_fee', 'availability', 'created_at', 'updated_at'
+            'consultation_fee', 'availability', 'active_patient_count',
+            'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'active_patient_count', 'created_at', 'updated_at']
         
     def validate_license_number(self, value):
         """Ensure license number is unique"""
@@ -38,4 +40,17 @@ class DoctorSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Consultation fee cannot be negative.")
         if value > 100000:
             raise serializers.ValidationError("Consultation fee seems unrealistic.")
-        return value
\ No newline at end of file
+        return value
+
+class DoctorBulkSerializer(DoctorSerializer):
+    """Row serializer for bulk uploads; license uniqueness is checked per batch by the view"""
+
+    class Meta(DoctorSerializer.Meta):
+        extra_kwargs = {'license_number': {'validators': []}}
+
+    def validate_license_number(self, value):
+        return value
+
+class DoctorFastSerializer(FastSerializer):
+    """Read-only fast path with the same output as DoctorSerializer"""
+    serializer_class = DoctorSerializer
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Doctor
+from . import cache as doctor_cache
+from .availability import sync_availability
+
+
+@receiver(post_save, sender=Doctor)
+@receiver(post_delete, sender=Doctor)
+def invalidate_doctor_cache(sender, **kwargs):
+    """Any write to the directory invalidates all cached pages and details"""
+    doctor_cache.bump_generation()
+    # Bump again on commit so pages re-cached from pre-commit reads are dropped too
+    transaction.on_commit(doctor_cache.bump_generation)
+
+
+@receiver(post_save, sender=Doctor)
+def sync_availability_slots(sender, instance, update_fields=None, **kwargs):
+    """Make sure the free-form availability text has its indexed slots"""
+    if update_fields is None or 'availability' in update_fields:
+        sync_availability([instance.availability])
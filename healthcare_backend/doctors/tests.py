@@ -1,3 +1,255 @@
-from django.test import TestCase
+import base64
+import json
+from urllib.parse import urlencode
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from users.models import User
+from .models import AvailabilitySlot, Doctor
+from .availability import parse_availability
+from . import cache as doctor_cache
 
-# Create your tests here.
+
+def create_doctor(index, **overrides):
+    data = {
+        'name': f'Doctor {index}', 'email': f'doctor{index}@example.com',
+        'phone': '9876543212', 'specialization': 'Cardiology',
+        'license_number': f'LIC-{index}', 'experience_years': 5, 'address': 'Clinic',
+        'consultation_fee': '500.00', 'availability': 'Mon-Fri 9AM-5PM',
+    }
+    data.update(overrides)
+    return Doctor.objects.create(**data)
+
+
+class DoctorPaginationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        # Duplicate names force the cursor to rely on the id tiebreak
+        for i in range(7):
+            create_doctor(i, name=f'Doctor {i // 3}')
+
+    def test_pages_follow_name_then_id_without_gaps(self):
+        expected = list(Doctor.objects.order_by('name', 'id').values_list('id', flat=True))
+        seen = []
+        url = reverse('doctor-list-create') + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(doctor['id'] for doctor in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(reverse('doctor-list-create') + '?page_size=3')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('doctor-list-create') + '?cursor=cD1ub3Rqc29u')
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_values_are_rejected(self):
+        # Well-formed cursors whose values don't parse as the ordering fields' types
+        for name, position in (
+            ('doctor-list-create', ['Doctor 0', 'garbage']),
+            ('patient-list-create', ['garbage', '1']),
+        ):
+            cursor = base64.b64encode(urlencode({'p': json.dumps(position)}).encode()).decode()
+            with self.subTest(name):
+                response = self.client.get(reverse(name), {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+class DoctorCacheTests(APITestCase):
+
+    def setUp(self):
+        doctor_cache.get_cache().clear()
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        self.doctor = create_doctor(1)
+
+    def test_repeated_reads_skip_the_database(self):
+        list_url = reverse('doctor-list-create')
+        detail_url = reverse('doctor-detail', args=[self.doctor.pk])
+        first_list = self.client.get(list_url).data
+        first_detail = self.client.get(detail_url).data
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(list_url).data, first_list)
+            self.assertEqual(self.client.get(detail_url).data, first_detail)
+
+    def test_not_modified_is_answered_from_cache(self):
+        url = reverse('doctor-list-create')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_writes_invalidate_cached_payloads(self):
+        detail_url = reverse('doctor-detail', args=[self.doctor.pk])
+        self.client.get(detail_url)
+        self.client.get(reverse('doctor-list-create'))
+
+        response = self.client.patch(detail_url, {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(detail_url).data['name'], 'Renamed')
+
+        create_doctor(2)
+        self.assertEqual(len(self.client.get(reverse('doctor-list-create')).data['results']), 2)
+
+        self.doctor.delete()
+        self.assertEqual(self.client.get(detail_url).status_code, 404)
+
+
+class DoctorBulkCreateTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def post_ndjson(self, count, offset=0):
+        lines = [
+            json.dumps({
+                'name': f'Doctor {i}', 'email': f'doctor{i}@example.com',
+                'phone': '9876543212', 'specialization': 'Cardiology',
+                'license_number': f'LIC-{i}', 'experience_years': 5, 'address': 'Clinic',
+                'consultation_fee': '500.00', 'availability': 'Mon-Fri 9AM-5PM',
+            })
+            for i in range(offset, offset + count)
+        ]
+        return self.client.post(
+            reverse('doctor-bulk-create'), '\n'.join(lines), content_type='application/x-ndjson'
+        )
+
+    def test_ndjson_upload_uses_constant_queries_per_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.post_ndjson(2).status_code, 201)
+        with CaptureQueriesContext(connection) as large:
+            response = self.post_ndjson(50, offset=2)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertEqual(Doctor.objects.count(), 52)
+
+    def test_duplicate_license_is_reported(self):
+        create_doctor(0)
+        response = self.post_ndjson(2)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['errors'], [{
+            'index': 0,
+            'errors': {'license_number': ['A doctor with this license number already exists.']},
+        }])
+
+
+class DoctorSearchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        create_doctor(0, name='Priya Sharma', specialization='Cardiology')
+        create_doctor(1, name='Arjun Cardio', specialization='Neurology')
+        create_doctor(2, name='Meera Nair', specialization='Pediatric Cardiology')
+        create_doctor(3, name='Ravi Kumar', specialization='Dermatology')
+
+    def search(self, query):
+        response = self.client.get(reverse('doctor-search'), {'q': query})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [doctor['name'] for doctor in response.data['results']]
+
+    def test_name_matches_rank_first(self):
+        self.assertEqual(self.search('cardio'), ['Arjun Cardio', 'Meera Nair', 'Priya Sharma'])
+        self.assertEqual(self.search('PRIYA cardiology'), ['Priya Sharma'])
+        self.assertEqual(self.search('oncology'), [])
+
+    def test_ranked_pages_match_the_regular_serializer(self):
+        names, url = [], reverse('doctor-search') + '?q=cardio&page_size=2'
+        while url:
+            with self.settings(FAST_SERIALIZATION=False):
+                slow = self.client.get(url)
+            with self.settings(FAST_SERIALIZATION=True):
+                fast = self.client.get(url)
+            self.assertEqual(fast.content, slow.content)
+            names.extend(doctor['name'] for doctor in fast.data['results'])
+            url = fast.data['next']
+        self.assertEqual(names, self.search('cardio'))
+
+    def test_query_is_required(self):
+        response = self.client.get(reverse('doctor-search'), {'q': '  '})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('q', response.data)
+
+
+class DoctorFilterTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        create_doctor(0, name='Asha', consultation_fee='500.00', experience_years=3)
+        create_doctor(1, name='Bala', consultation_fee='1500.00', experience_years=12,
+                      availability='Tue, Thu 10AM-2PM; Sat 9-11AM')
+        create_doctor(2, name='Chitra', specialization='Neurology', consultation_fee='900.00',
+                      experience_years=20, availability='Weekends 22:00-06:00')
+
+    def names(self, **params):
+        response = self.client.get(reverse('doctor-list-create'), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [doctor['name'] for doctor in response.data['results']]
+
+    def test_parse_availability(self):
+        self.assertEqual(parse_availability('Mon-Wed 9AM-5PM'), [(0, 540, 1020), (1, 540, 1020), (2, 540, 1020)])
+        self.assertEqual(parse_availability('Fri 10-2PM, Sun 9-5'), [(4, 600, 840), (6, 540, 1020)])
+        # Overnight slots continue on the next day
+        self.assertEqual(parse_availability('Sun 10PM-2AM'), [(0, 0, 120), (6, 1320, 1440)])
+        self.assertEqual(parse_availability('On call'), [])
+
+    def test_filters_combine(self):
+        self.assertEqual(self.names(specialization='Cardiology'), ['Asha', 'Bala'])
+        self.assertEqual(self.names(specialization='Cardiology,Neurology', min_fee='800'), ['Bala', 'Chitra'])
+        self.assertEqual(self.names(max_fee='1000', min_experience='10'), ['Chitra'])
+        self.assertEqual(self.names(available_on='tuesday', available_at='10AM'), ['Asha', 'Bala'])
+        self.assertEqual(self.names(available_on='sat', available_at='10:30'), ['Bala'])
+        self.assertEqual(self.names(available_on='mon', available_at='3am'), ['Chitra'])
+        self.assertEqual(self.names(available_on='sun'), ['Chitra'])
+
+    def test_invalid_filters_are_rejected(self):
+        response = self.client.get(reverse('doctor-list-create'), {
+            'min_fee': 'cheap', 'available_on': 'someday', 'available_at': '25:00',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'min_fee', 'available_on', 'available_at'})
+
+    def test_slots_follow_availability_edits(self):
+        doctor = Doctor.objects.get(name='Asha')
+        response = self.client.patch(
+            reverse('doctor-detail', args=[doctor.pk]), {'availability': 'Wed 4PM-8PM'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(AvailabilitySlot.objects.filter(schedule='Wed 4PM-8PM').values_list('weekday', 'start_minute', 'end_minute')),
+            [(2, 960, 1200)]
+        )
+        # Slots are stored once per distinct text, not once per doctor
+        self.assertEqual(AvailabilitySlot.objects.filter(schedule='Mon-Fri 9AM-5PM').count(), 5)
+        self.assertEqual(self.names(available_on='wed', available_at='5PM'), ['Asha'])
+        self.assertEqual(self.names(available_on='mon'), ['Chitra'])
+
+    def test_facets_come_from_one_grouped_query(self):
+        url = reverse('doctor-facets')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'specialization': 'Neurology', 'min_fee': '800'})
+        # Facets ignore their own filter, so other specializations stay selectable
+        self.assertEqual(response.data, {'specialization': [
+            {'value': 'Cardiology', 'count': 1}, {'value': 'Neurology', 'count': 1},
+        ]})
+        self.assertEqual(self.client.get(url).data['specialization'][0], {'value': 'Cardiology', 'count': 2})
@@ -1,7 +1,15 @@
 from django.urls import path
-from .views import DoctorListCreateView, DoctorDetailView
+from .views import (
+    DoctorListCreateView, DoctorDetailView, DoctorBulkCreateView,
+    DoctorAsyncListView, DoctorAsyncDetailView, DoctorSearchView, DoctorFacetView,
+)
 
 urlpatterns = [
     path('', DoctorListCreateView.as_view(), name='doctor-list-create'),
     path('<int:pk>/', DoctorDetailView.as_view(), name='doctor-detail'),
+    path('bulk/', DoctorBulkCreateView.as_view(), name='doctor-bulk-create'),
+    path('search/', DoctorSearchView.as_view(), name='doctor-search'),
+    path('facets/', DoctorFacetView.as_view(), name='doctor-facets'),
+    path('async/', DoctorAsyncListView.as_view(), name='doctor-async-list'),
+    path('async/<int:pk>/', DoctorAsyncDetailView.as_view(), name='doctor-async-detail'),
 ]
\ No newline at end of file
@@ -1,17 +1,129 @@
+from django.utils.decorators import method_decorator
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Doctor
-from .serializers import DoctorSerializer
+from .serializers import DoctorSerializer, DoctorBulkSerializer, DoctorFastSerializer
+from . import cache as doctor_cache
+from .signals import invalidate_doctor_cache
+from .filters import DoctorFilterBackend, FILTER_PARAMETERS, specialization_facets
+from .availability import sync_availability
+from healthcare_backend.conditional import ConditionalGetMixin
+from healthcare_backend.bulk import BulkCreateAPIView
+from healthcare_backend.fast_serializers import FastListMixin
+from healthcare_backend.sparse_fields import SparseFieldsMixin
+from healthcare_backend.db_routing import ReplicaReadMixin
+from healthcare_backend.async_views import AsyncListView, AsyncDetailView
+from healthcare_backend.search import SearchListView, SEARCH_PARAMETER
 
-class DoctorListCreateView(generics.ListCreateAPIView):
+class DoctorCacheMixin:
+    """Serve serialized doctor payloads from the versioned directory cache"""
+
+    def list(self, request, *args, **kwargs):
+        # Pages are shared by every user, so cache them by full URL (cursor + page size)
+        data = doctor_cache.get_or_set(
+            'list', request.build_absolute_uri(),
+            lambda: super(DoctorCacheMixin, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        # Keyed by full URL, since ?fields= / ?expand= change the payload
+        data = doctor_cache.get_or_set(
+            'detail', request.build_absolute_uri(),
+            lambda: super(DoctorCacheMixin, self).retrieve(request, *args, **kwargs).data
+        )
+        return Response(data)
+
+@method_decorator(name='get', decorator=swagger_auto_schema(manual_parameters=FILTER_PARAMETERS))
+class DoctorListCreateView(ReplicaReadMixin, SparseFieldsMixin, ConditionalGetMixin, DoctorCacheMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = DoctorSerializer
+    fast_serializer_class = DoctorFastSerializer
     permission_classes = [IsAuthenticated]
+    # The directory cache is shared by every user until the next write, so fill it from the primary
+    replica_reads = False
+    filter_backends = [DoctorFilterBackend]
     
     def get_queryset(self):
         # Return all doctors (no user filtering needed as per assignment)
         return Doctor.objects.all()
 
-class DoctorDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def get_list_validators(self):
+        # Validators live in the same generation as the payloads, so a 304 needs no query
+        return doctor_cache.get_or_set(
+            'list-validators',
+            (self.request.build_absolute_uri(), self.request.accepted_renderer.format),
+            super().get_list_validators,
+        )
+
+class DoctorDetailView(ReplicaReadMixin, SparseFieldsMixin, ConditionalGetMixin, DoctorCacheMixin, generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = DoctorSerializer
+    permission_classes = [IsAuthenticated]
+    replica_reads = False
+    queryset = Doctor.objects.all()
+
+    def get_detail_validators(self):
+        return doctor_cache.get_or_set(
+            'detail-validators',
+            (self.request.build_absolute_uri(), self.request.accepted_renderer.format),
+            super().get_detail_validators,
+        )
+
+class DoctorBulkCreateView(BulkCreateAPIView):
+    """Create many doctors at once from a JSON array or NDJSON stream"""
+    serializer_class = DoctorBulkSerializer
+    permission_classes = [IsAuthenticated]
+    unique_fields = ('license_number',)
+    unique_error_messages = {
+        'license_number': 'A doctor with this license number already exists.',
+    }
+
+    def perform_bulk_create(self, created_ids):
+        # bulk_create sends no post_save signals, so store the slots and invalidate the cache here
+        if created_ids:
+            sync_availability(
+                Doctor.objects.filter(pk__in=created_ids).values_list('availability', flat=True).distinct()
+            )
+            invalidate_doctor_cache(sender=Doctor)
+
+class DoctorSearchView(SearchListView):
+    """Doctors ranked by how well name and specialization match `?q=`, with the directory filters"""
     serializer_class = DoctorSerializer
+    fast_serializer_class = DoctorFastSerializer
     permission_classes = [IsAuthenticated]
-    queryset = Doctor.objects.all()
\ No newline at end of file
+    queryset = Doctor.objects.all()
+    filter_backends = [DoctorFilterBackend]
+
+    @swagger_auto_schema(manual_parameters=[SEARCH_PARAMETER, *FILTER_PARAMETERS])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+class DoctorFacetView(ReplicaReadMixin, generics.GenericAPIView):
+    """Doctor counts per specialization under the same filters as the directory"""
+    permission_classes = [IsAuthenticated]
+    queryset = Doctor.objects.all()
+    pagination_class = None
+    # Cached with the directory pages, so read from the primary like them
+    replica_reads = False
+
+    @swagger_auto_schema(manual_parameters=FILTER_PARAMETERS, responses={200: 'Facet counts'})
+    def get(self, request, *args, **kwargs):
+        data = doctor_cache.get_or_set(
+            'facets', request.build_absolute_uri(),
+            lambda: {'specialization': specialization_facets(self.get_queryset(), request.query_params)}
+        )
+        return Response(data)
+
+class DoctorAsyncListView(AsyncListView):
+    """Async twin of the doctor list (GET only, uncached)"""
+    fast_serializer_class = DoctorFastSerializer
+
+    def get_queryset(self, user):
+        return Doctor.objects.all()
+
+class DoctorAsyncDetailView(AsyncDetailView):
+    fast_serializer_class = DoctorFastSerializer
+
+    def get_queryset(self, user):
+        return Doctor.objects.all()
@@ -0,0 +1,128 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from users.authentication import ClaimsJWTAuthentication
+from .db_routing import aget_read_alias, read_from
+from .events import broker
+from .renderers import FastJSONRenderer
+
+
+class AsyncReadView(View):
+    """Base for async-native GET endpoints served through the async ORM.
+
+    Under ASGI a request waiting on the database yields the event loop instead
+    of holding a worker. Rows come from `.values()` and are rendered by the
+    view's FastSerializer, so payloads match the sync endpoints byte for byte,
+    and read from a replica under the same rules as ReplicaReadMixin.
+    Only claim-bearing JWTs skip the database; sparse fields, ETags and the
+    doctor cache stay on the sync views.
+    """
+    http_method_names = ['get', 'head', 'options']
+    fast_serializer_class = None
+    authentication_class = ClaimsJWTAuthentication
+    renderer_class = FastJSONRenderer
+
+    def get_queryset(self, user):
+        raise NotImplementedError
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user = await self.authenticate(request)
+            with read_from(await aget_read_alias(user)):
+                data = await self.get_data(Request(request), user, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.error_response(exc)
+        return self.render(data)
+
+    async def authenticate(self, request):
+        authenticator = self.authentication_class()
+        result = await authenticator.aauthenticate(request)
+        if result is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = result
+        return result[0]
+
+    async def get_data(self, request, user, *args, **kwargs):
+        raise NotImplementedError
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        renderer = self.renderer_class()
+        return HttpResponse(renderer.render(data), status=status_code, content_type=renderer.media_type)
+
+    def error_response(self, exc):
+        # Same body and headers as DRF's exception handler
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, exc.status_code)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response['WWW-Authenticate'] = self.authentication_class().authenticate_header(self.request)
+        return response
+
+
+class AsyncListView(AsyncReadView):
+    """Async list endpoint paginated like the sync views"""
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+
+    async def get_data(self, request, user, *args, **kwargs):
+        fast = self.fast_serializer_class
+        queryset = self.get_queryset(user)
+        lookups = fast.get_lookups()
+        paginator = self.pagination_class() if self.pagination_class else None
+        if paginator is not None:
+            for field in paginator.get_ordering(request, queryset, self):
+                # The cursor position is read off the last row
+                if field.lstrip('-') not in lookups:
+                    lookups.append(field.lstrip('-'))
+        rows = queryset.values(*lookups)
+
+        if paginator is not None:
+            page = await paginator.apaginate_queryset(rows, request, view=self)
+            if page is not None:
+                return paginator.get_paginated_response(fast.serialize(page)).data
+        return fast.serialize([row async for row in rows.aiterator()])
+
+
+class AsyncDetailView(AsyncReadView):
+    """Async detail endpoint looked up by primary key"""
+
+    async def get_data(self, request, user, pk):
+        queryset = self.get_queryset(user).values(*self.fast_serializer_class.get_lookups())
+        try:
+            row = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            raise exceptions.NotFound(f'No {queryset.model._meta.object_name} matches the given query.')
+        return self.fast_serializer_class.serialize([row])[0]
+
+
+class EventStreamView(AsyncReadView):
+    """Server-sent events published to the authenticated user's broker key.
+
+    The user is authenticated once when the stream opens (claim-bearing JWTs
+    without touching the database); after that an idle stream only wakes for
+    keepalives, and it ends when the access token expires.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user = await self.authenticate(request)
+        except exceptions.APIException as exc:
+            return self.error_response(exc)
+        # WSGI would buffer an endless async iterator instead of streaming it
+        if not isinstance(request, ASGIRequest):
+            return self.render(
+                {'detail': 'Event streams are only served by the ASGI application.'},
+                status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        response = StreamingHttpResponse(
+            broker.stream(self.get_stream_key(user), until=request.auth.get('exp')),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Keep nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def get_stream_key(self, user):
+        return user.pk
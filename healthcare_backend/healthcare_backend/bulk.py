@@ -0,0 +1,127 @@
+from itertools import islice
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import generics, status
+from rest_framework.response import Response
+from .db_routing import ReplicaReadMixin
+from .parsers import FastJSONParser, NDJSONParser
+
+
+class BulkCreateAPIView(ReplicaReadMixin, generics.GenericAPIView):
+    """Create many rows from a JSON array or an NDJSON stream in one transaction.
+
+    Rows are validated one by one without touching the database, then each
+    batch checks `unique_fields` with one `IN (...)` query per field and is
+    written with a single bulk_create. Invalid rows are skipped and reported
+    by their position in the input; valid rows are still created.
+    """
+    parser_classes = [FastJSONParser, NDJSONParser]
+    # Model fields that must be unique, checked set-wise per batch
+    unique_fields = ()
+    # Optional {field: message} overrides for duplicate errors
+    unique_error_messages = {}
+    batch_size = None
+
+    def get_batch_size(self):
+        return self.batch_size or settings.BULK_CREATE_BATCH_SIZE
+
+    def get_instance_kwargs(self):
+        """Extra attributes set on every created row (e.g. created_by)"""
+        return {}
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if isinstance(rows, (dict, str, bytes)) or not hasattr(rows, '__iter__'):
+            return Response(
+                {'detail': 'Expected a JSON array or an NDJSON stream of objects.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = iter(rows)
+        batch_size = self.get_batch_size()
+        created_ids, errors, offset = [], [], 0
+        try:
+            with transaction.atomic():
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    created_ids.extend(self.create_batch(batch, offset, errors))
+                    offset += len(batch)
+                self.perform_bulk_create(created_ids)
+            errors.sort(key=lambda error: error['index'])
+        except IntegrityError:
+            # A concurrent writer took one of the unique values after our check
+            return Response(
+                {'detail': 'A conflicting row was created concurrently, please retry.'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif created_ids:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            'created': len(created_ids),
+            'ids': created_ids,
+            'errors': errors,
+        }, status=response_status)
+
+    def create_batch(self, batch, offset, errors):
+        """Validate and insert one batch; returns the new primary keys"""
+        valid = []
+        for index, row in enumerate(batch, start=offset):
+            if not isinstance(row, dict):
+                errors.append({'index': index, 'errors': {'non_field_errors': ['Expected an object.']}})
+                continue
+            serializer = self.get_serializer(data=row)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        valid = self.check_unique_fields(valid, errors)
+        model = self.get_serializer_class().Meta.model
+        extra = self.get_instance_kwargs()
+        instances = model.objects.bulk_create(
+            [model(**data, **extra) for _, data in valid]
+        )
+        return [instance.pk for instance in instances]
+
+    def check_unique_fields(self, valid, errors):
+        """Drop rows that clash with existing rows or with earlier rows in the input"""
+        model = self.get_serializer_class().Meta.model
+        for field in self.unique_fields:
+            values = {data[field] for _, data in valid if data.get(field) is not None}
+            taken = set(
+                model.objects.filter(**{f'{field}__in': values}).values_list(field, flat=True)
+            ) if values else set()
+
+            message = self.get_unique_error_message(model, field)
+            remaining = []
+            for index, data in valid:
+                value = data.get(field)
+                if value in taken:
+                    errors.append({'index': index, 'errors': {field: [message]}})
+                    continue
+                if value is not None:
+                    taken.add(value)
+                remaining.append((index, data))
+            valid = remaining
+        return valid
+
+    def get_unique_error_message(self, model, field):
+        if field in self.unique_error_messages:
+            return self.unique_error_messages[field]
+        model_field = model._meta.get_field(field)
+        # Same wording as the UniqueValidator on the single-row endpoints
+        return model_field.error_messages['unique'] % {
+            'model_name': model._meta.verbose_name,
+            'field_label': model_field.verbose_name,
+        }
+
+    def perform_bulk_create(self, created_ids):
+        """Hook run inside the transaction once every batch is written"""
+        pass
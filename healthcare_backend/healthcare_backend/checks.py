@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends that keep entries inside one process
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, Tags.database)
+def check_replica_pin_cache(app_configs, **kwargs):
+    """Read-after-write pins only work if every worker sees them"""
+    if not settings.DATABASE_REPLICAS:
+        return []
+    backend = settings.CACHES.get(settings.REPLICA_PIN_CACHE, {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Error(
+            f'REPLICA_PIN_CACHE {settings.REPLICA_PIN_CACHE!r} uses {backend}, which is not shared '
+            'between workers, so a user could read a lagging replica right after writing.',
+            hint='Point REPLICA_PIN_CACHE at a Redis or Memcached cache, or unset DATABASE_REPLICA_URLS.',
+            id='healthcare_backend.E001',
+        )]
+    return []
@@ -0,0 +1,187 @@
+import gzip
+import re
+import zlib
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipStream:
+    def __init__(self, level):
+        # wbits=31 writes the gzip container rather than raw zlib
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        # Sync-flush, so each chunk reaches the client as soon as the view yields it
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+# content coding -> (one-shot compress(data, level), incremental compressor, valid levels)
+CODECS = {
+    'zstd': (lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), ZstdStream, range(1, 23)),
+    'br': (lambda data, level: brotli.compress(data, quality=level), BrotliStream, range(0, 12)),
+    'gzip': (lambda data, level: gzip.compress(data, compresslevel=level, mtime=0), GzipStream, range(1, 10)),
+}
+# Codings whose library is installed
+AVAILABLE = {
+    coding for coding, installed in (('zstd', zstandard), ('br', brotli), ('gzip', zlib)) if installed is not None
+}
+
+
+_CODING_SUFFIX = re.compile(r'-(?:%s)"' % '|'.join(CODECS))
+
+
+def strip_coding_suffix(header):
+    """An If-Match / If-None-Match header with our per-coding ETag suffixes removed"""
+    return _CODING_SUFFIX.sub('"', header)
+
+
+def parse_accept_encoding(header):
+    """{coding: q-value} from an Accept-Encoding header"""
+    accepted = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def choose_coding(header, preference=None):
+    """The client's highest-q coding among ours; ties go to the first in COMPRESSION_ENCODINGS"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in preference or settings.COMPRESSION_ENCODINGS:
+        if coding not in AVAILABLE:
+            continue
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_sequence(chunks, stream):
+    for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def acompress_sequence(chunks, stream):
+    async for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+    """Compress JSON, NDJSON and CSV responses with the best coding the client accepts.
+
+    Bodies under COMPRESSION_MIN_SIZE, or that don't shrink, are sent as they
+    are. Streaming responses (the exports) are compressed chunk by chunk, so
+    they stay streamed. Responses that already carry a Content-Encoding, like
+    the precompressed schema, and event streams pass through.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if not self.compressible(response):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = choose_coding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+
+        compress, stream_class, _ = CODECS[coding]
+        level = settings.COMPRESSION_LEVELS[coding]
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_sequence(response.streaming_content, stream_class(level))
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content, stream_class(level))
+            del response['Content-Length']
+        else:
+            compressed = compress(response.content, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # Each coding is its own representation, so the ETag stays strong but coding-specific;
+        # ConditionalGetMixin strips the suffix again when checking If-Match / If-None-Match
+        etag = response.get('ETag')
+        if etag and etag.endswith('"'):
+            response['ETag'] = f'{etag[:-1]}-{coding}"'
+        response['Content-Encoding'] = coding
+        return response
+
+    def compressible(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.has_header('Content-Encoding'):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        media_type = response.get('Content-Type', '').partition(';')[0].strip().lower()
+        return media_type in settings.COMPRESSION_CONTENT_TYPES or media_type.endswith('+json')
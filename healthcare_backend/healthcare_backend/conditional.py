@@ -0,0 +1,119 @@
+import hashlib
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from .compression import strip_coding_suffix
+
+
+def _resolve(instance, lookup):
+    """Follow a `patient__updated_at` style lookup on a model instance"""
+    for attr in lookup.split('__'):
+        instance = getattr(instance, attr, None)
+    return instance
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified support for generic views, evaluated before serialization.
+
+    Lists are validated with a single `max(updated_at)` + `count(*)` aggregate and
+    details with the row's own `updated_at`, so a matching If-None-Match or
+    If-Modified-Since returns 304 without running the serializer. PUT/PATCH honour
+    If-Match / If-Unmodified-Since for optimistic concurrency, with the row locked
+    while the precondition is checked.
+    """
+    # Timestamps that change the representation; include nested relations here
+    conditional_timestamp_fields = ('updated_at',)
+    lock_for_update = False
+
+    def get_conditional_timestamp_fields(self):
+        return self.conditional_timestamp_fields
+
+    def get_object(self):
+        # Memoized so the validators and the serializer share one query
+        if not hasattr(self, '_conditional_object'):
+            self._conditional_object = super().get_object()
+        return self._conditional_object
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.lock_for_update:
+            queryset = queryset.select_for_update(of=('self',))
+        return queryset
+
+    def make_etag(self, *parts):
+        # The query string (cursor, page size) and format pick a different representation
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        parts += (self.request.get_full_path(), getattr(renderer, 'format', ''))
+        return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+    def get_list_validators(self):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        aggregates = {
+            f'last_{index}': Max(field)
+            for index, field in enumerate(self.get_conditional_timestamp_fields())
+        }
+        values = queryset.aggregate(count=Count('pk'), **aggregates)
+        count = values.pop('count')
+        last_modified = max(filter(None, values.values()), default=None)
+        return self.make_etag(queryset.model._meta.label, count, last_modified), last_modified
+
+    def get_object_validators(self, instance):
+        timestamps = [_resolve(instance, field) for field in self.get_conditional_timestamp_fields()]
+        last_modified = max(filter(None, timestamps), default=None)
+        return self.make_etag(instance._meta.label, instance.pk, last_modified), last_modified
+
+    def get_detail_validators(self):
+        return self.get_object_validators(self.get_object())
+
+    def evaluate_preconditions(self, etag, last_modified):
+        """Return a 304/412 response if the request's preconditions say so, else None"""
+        # Compressed responses carry `"<etag>-gzip"` etc.; they validate like the plain one
+        for header in ('HTTP_IF_MATCH', 'HTTP_IF_NONE_MATCH'):
+            if header in self.request.META:
+                self.request.META[header] = strip_coding_suffix(self.request.META[header])
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code < 300 or response.status_code == 304:
+            response.headers['ETag'] = etag
+            if last_modified:
+                response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+            # Clients may keep a copy but must revalidate it on every use
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators()
+        response = self.evaluate_preconditions(etag, last_modified)
+        if response is not None:
+            return response
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_detail_validators()
+        response = self.evaluate_preconditions(etag, last_modified)
+        if response is not None:
+            return response
+        response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        conditional = 'HTTP_IF_MATCH' in request.META or 'HTTP_IF_UNMODIFIED_SINCE' in request.META
+        with transaction.atomic():
+            # Hold the row lock between checking If-Match and saving
+            self.lock_for_update = conditional
+            etag, last_modified = self.get_object_validators(self.get_object())
+            self.lock_for_update = False
+            response = self.evaluate_preconditions(etag, last_modified)
+            if response is not None:
+                return response
+            response = super().update(request, *args, **kwargs)
+
+        etag, last_modified = self.get_object_validators(self.get_object())
+        return self.set_validators(response, etag, last_modified)
@@ -0,0 +1,143 @@
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+# Alias the current request reads from; None means the primary
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+# alias -> (monotonic time measured, seconds behind the primary)
+_replica_lag = {}
+
+# Zero when everything received has been replayed, so an idle primary doesn't look like lag
+LAG_QUERY = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def measure_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        logger.warning('Could not measure replication lag on %s', alias, exc_info=True)
+        return float('inf')
+
+
+def replica_lag(alias):
+    """Seconds `alias` is behind the primary, re-measured every REPLICA_LAG_CHECK_INTERVAL"""
+    now = time.monotonic()
+    measured_at, lag = _replica_lag.get(alias, (None, None))
+    if measured_at is None or now - measured_at >= settings.REPLICA_LAG_CHECK_INTERVAL:
+        lag = measure_lag(alias)
+        _replica_lag[alias] = (now, lag)
+    return lag
+
+
+def choose_replica():
+    """A random replica within REPLICA_MAX_LAG of the primary, or None if none is"""
+    caught_up = [
+        alias for alias in settings.DATABASE_REPLICAS
+        if replica_lag(alias) <= settings.REPLICA_MAX_LAG
+    ]
+    return random.choice(caught_up) if caught_up else None
+
+
+def _pin_key(user):
+    return f'replica-pin:{user.pk}'
+
+
+def pin_to_primary(user):
+    """Keep `user`'s reads on the primary until the replicas have their write"""
+    if settings.DATABASE_REPLICAS and user.is_authenticated:
+        # Replicas further behind than REPLICA_MAX_LAG are never read, but their lag is only
+        # re-measured every REPLICA_LAG_CHECK_INTERVAL, so one may be that much further behind
+        timeout = settings.REPLICA_MAX_LAG + settings.REPLICA_LAG_CHECK_INTERVAL
+        caches[settings.REPLICA_PIN_CACHE].set(_pin_key(user), True, timeout)
+
+
+def is_pinned(user):
+    return caches[settings.REPLICA_PIN_CACHE].get(_pin_key(user), False)
+
+
+def get_read_alias(user):
+    """Replica alias for `user`'s next read-only request, or None for the primary"""
+    if not settings.DATABASE_REPLICAS or (user.is_authenticated and is_pinned(user)):
+        return None
+    return choose_replica()
+
+
+async def aget_read_alias(user):
+    if not settings.DATABASE_REPLICAS:
+        return None
+    # The lag check and the pin lookup may both block
+    return await sync_to_async(get_read_alias)(user)
+
+
+@contextmanager
+def read_from(alias):
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Send reads to the replica picked for the current request, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        # Reads inside a transaction must see its own writes
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """Serve GET/HEAD from a read replica and pin a user to the primary after a write.
+
+    The replica is picked once per request after authentication, so every query
+    of a response sees the same snapshot. Views whose reads are cached for other
+    users can set `replica_reads = False` and still pin on writes.
+    """
+    replica_reads = True
+
+    def dispatch(self, request, *args, **kwargs):
+        with read_from(None):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.replica_reads and request.method in SAFE_METHODS:
+            _read_alias.set(get_read_alias(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,108 @@
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _relation_path(model, source):
+    """Walk a dotted serializer source and return the relations it crosses.
+
+    Returns a list of (field_name, is_many) tuples, stopping at the first
+    attribute that is not a model relation.
+    """
+    path = []
+    for attr in source.split('.'):
+        if model is None:
+            break
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not model_field.is_relation:
+            break
+        path.append((attr, model_field.many_to_many or model_field.one_to_many))
+        model = model_field.related_model
+    return path
+
+
+def _needs_related_object(field):
+    """Return False for fields that only read the FK column (e.g. PrimaryKeyRelatedField)"""
+    if isinstance(field, serializers.ManyRelatedField):
+        return _needs_related_object(field.child_relation)
+    if isinstance(field, serializers.RelatedField):
+        return not field.use_pk_only_optimization()
+    return True
+
+
+def _nested_serializer_class(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.ModelSerializer):
+        return type(field)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def get_related_lookups(serializer_class, prefix=''):
+    """Derive (select_related, prefetch_related) lookups from a serializer's declared fields.
+
+    Forward FK / one-to-one relations are joined with select_related, while
+    reverse and many-to-many relations are prefetched. Nested model serializers
+    are followed recursively so their own relations are loaded too.
+    """
+    select, prefetch = [], []
+    serializer = serializer_class()
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return (), ()
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        path = _relation_path(model, field.source)
+        if not path:
+            continue
+
+        nested_class = _nested_serializer_class(field)
+        # A trailing relation read only by its pk does not need a join
+        if nested_class is None and not _needs_related_object(field):
+            path = path[:-1]
+            if not path:
+                continue
+
+        lookup = prefix + '__'.join(name for name, _ in path)
+        is_many = any(many for _, many in path)
+        (prefetch if is_many else select).append(lookup)
+
+        if nested_class is not None:
+            nested_select, nested_prefetch = get_related_lookups(nested_class, lookup + '__')
+            # Anything below a prefetched relation has to be prefetched as well
+            if is_many:
+                prefetch.extend(nested_select)
+            else:
+                select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+
+    return tuple(dict.fromkeys(select)), tuple(dict.fromkeys(prefetch))
+
+
+def eager_load(queryset, serializer_class):
+    """Apply the lookups needed by serializer_class to queryset"""
+    select, prefetch = get_related_lookups(serializer_class)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """Generic view mixin that eager-loads everything the serializer will touch.
+
+    Hooks into filter_queryset() so views can keep overriding get_queryset()
+    with plain filters; list, retrieve and destroy all go through it.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return eager_load(queryset, self.get_serializer_class())
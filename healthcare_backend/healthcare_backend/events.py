@@ -0,0 +1,108 @@
+import asyncio
+import itertools
+import threading
+import time
+from django.conf import settings
+from .renderers import FastJSONRenderer
+
+
+def format_event(event, data, event_id=None):
+    """One server-sent event as wire bytes"""
+    lines = [] if event_id is None else [f'id: {event_id}'.encode()]
+    lines.append(f'event: {event}'.encode())
+    lines.append(b'data: ' + FastJSONRenderer().render(data))
+    return b'\n'.join(lines) + b'\n\n'
+
+
+class Subscription:
+    """One stream's bounded queue, owned by the event loop that opened the stream"""
+
+    def __init__(self, key, maxsize):
+        self.key = key
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, message):
+        # Runs on self.loop; publishers never wait on a slow reader
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    """In-process fan-out of events to the streams subscribed to a key (a user id).
+
+    Publishing is thread-safe and costs nothing when nobody is listening. Each
+    subscriber has a bounded queue; one that falls EVENT_STREAM_QUEUE_SIZE
+    events behind is sent an `overflow` event and disconnected, so it can
+    catch up from the API instead of buffering without limit. Only streams
+    served by the publishing process receive its events.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._ids = itertools.count(1)
+
+    def subscribe(self, key, maxsize=None):
+        subscription = Subscription(key, maxsize or settings.EVENT_STREAM_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.key)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.key]
+
+    def subscriber_count(self, key):
+        with self._lock:
+            return len(self._subscribers.get(key, ()))
+
+    def publish(self, key, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, ()))
+        if not subscribers:
+            return
+        # Encoded once however many streams receive it
+        message = format_event(event, data, next(self._ids))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # The stream's event loop has shut down
+                self.unsubscribe(subscription)
+
+    async def stream(self, key, heartbeat=None, until=None, maxsize=None):
+        """Yield the SSE bytes published to `key` until `until` (epoch seconds) or disconnect"""
+        heartbeat = heartbeat or settings.EVENT_STREAM_HEARTBEAT
+        subscription = self.subscribe(key, maxsize)
+        try:
+            yield b': connected\n\n'
+            while True:
+                timeout = heartbeat if until is None else min(heartbeat, until - time.time())
+                if timeout <= 0:
+                    yield format_event('expired', {'detail': 'Token expired; reconnect with a fresh one.'})
+                    return
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    # Comment lines keep proxies from closing an idle connection
+                    yield b': keepalive\n\n'
+                    continue
+                if subscription.overflowed:
+                    yield format_event('overflow', {'detail': 'Too far behind; reload and reconnect.'})
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+
+broker = EventBroker()
@@ -0,0 +1,131 @@
+import csv
+import datetime
+import json
+from decimal import Decimal
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import generics, status
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def format_value(value):
+    """Render a database value the way the API serializers do"""
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class _Echo:
+    """File-like object whose write() just hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(columns, rows, chunk_size):
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(dict(zip(columns, map(format_value, row)))))
+        if len(buffer) >= chunk_size:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def iter_csv(columns, rows, chunk_size):
+    writer = csv.writer(_Echo())
+    buffer = [writer.writerow(columns)]
+    for row in rows:
+        buffer.append(writer.writerow([format_value(value) for value in row]))
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', iter_ndjson),
+    'csv': ('text/csv', iter_csv),
+}
+
+
+class PassthroughRenderer(BaseRenderer):
+    """Lets `Accept` negotiate an export format; the view writes the body itself"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class NDJSONRenderer(PassthroughRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVRenderer(PassthroughRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class StreamingExportView(generics.GenericAPIView):
+    """Stream get_queryset() as NDJSON or CSV (`?output=ndjson|csv`).
+
+    Rows are flat `values_list()` tuples read through a server-side cursor
+    (`QuerySet.iterator`), so memory stays constant however large the export.
+    """
+    # (column name, ORM lookup) pairs; lookups may span relations
+    export_fields = ()
+    export_name = 'export'
+    chunk_size = None
+    # JSON first, so errors and `Accept: */*` still get JSON
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer]
+
+    def get_chunk_size(self):
+        return self.chunk_size or settings.EXPORT_CHUNK_SIZE
+
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter(
+            'output', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+            enum=list(EXPORT_FORMATS), default='ndjson',
+        )],
+        responses={200: 'Streamed NDJSON or CSV rows'},
+    )
+    def get(self, request, *args, **kwargs):
+        # ?output= wins; otherwise the format negotiated from Accept, defaulting to NDJSON
+        negotiated = getattr(request.accepted_renderer, 'format', None)
+        output = request.query_params.get('output', negotiated if negotiated in EXPORT_FORMATS else 'ndjson')
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {'detail': f'Unsupported output "{output}". Use one of: {", ".join(EXPORT_FORMATS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        content_type, render = EXPORT_FORMATS[output]
+
+        columns = [column for column, _ in self.export_fields]
+        lookups = [lookup for _, lookup in self.export_fields]
+        chunk_size = self.get_chunk_size()
+        rows = self.get_queryset().values_list(*lookups).iterator(chunk_size=chunk_size)
+
+        response = StreamingHttpResponse(render(columns, rows, chunk_size), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{self.export_name}.{output}"'
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Error bodies are rendered as JSON even when Accept asked for CSV or NDJSON
+        renderer = getattr(request, 'accepted_renderer', None)
+        if isinstance(response, Response) and isinstance(renderer, PassthroughRenderer):
+            request.accepted_renderer = self.renderer_classes[0]()
+            request.accepted_media_type = request.accepted_renderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
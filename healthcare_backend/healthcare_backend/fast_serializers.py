@@ -0,0 +1,244 @@
+import datetime
+import decimal
+from functools import lru_cache
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _datetime_converter(field, current_timezone):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601 or not settings.USE_TZ:
+        return field.to_representation
+    target = getattr(field, 'timezone', None) or current_timezone
+    utc = datetime.timezone.utc
+    target_is_utc = str(target) in ('UTC', 'Etc/UTC')
+
+    def convert(value):
+        # Same steps as DateTimeField.enforce_timezone() + ISO 8601 output
+        if value.tzinfo is utc and target_is_utc:
+            # Drivers hand back UTC datetimes, skip the timezone conversion
+            return value.replace(tzinfo=None).isoformat() + 'Z'
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(target).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output:
+        return field.to_representation
+    if field.decimal_places is None:
+        return lambda value: f'{value:f}'
+    # Hoist what DecimalField.quantize() rebuilds on every call
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+    return lambda value: f'{value.quantize(exponent, rounding=rounding, context=context):f}'
+
+
+def _choice_converter(field):
+    mapping = field.choice_strings_to_values
+    if all(key == value for key, value in mapping.items()):
+        # String choices come back from the database already in output form
+        return None
+    return lambda value: mapping.get(str(value), value)
+
+
+def _converter_for(field, current_timezone):
+    """Return a callable turning a raw .values() value into the field's output, or None for identity"""
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field, current_timezone)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field)
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.ChoiceField):
+        return _choice_converter(field)
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # values() already yields the FK column
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if isinstance(field, (serializers.CharField, serializers.IntegerField,
+                          serializers.BooleanField, serializers.ReadOnlyField)):
+        # Database drivers already return str / int / bool for these
+        return None
+    if isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField)):
+        raise ImproperlyConfigured(f'Fast serialization does not support {type(field).__name__}.')
+    return field.to_representation
+
+
+class _Plan:
+    """Compiled field layout: the .values() lookups plus per-field converters.
+
+    Converters depend on the active timezone, so bind() resolves it once per
+    response rather than once per datetime value.
+    """
+
+    def __init__(self, serializer_class, string_lookups, prefix=''):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        self.lookups = []
+        self.steps = []
+        self.presence = None
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or isinstance(field, (
+                    serializers.ListSerializer, serializers.SerializerMethodField)):
+                raise ImproperlyConfigured(
+                    f'Fast serialization cannot compile {serializer_class.__name__}.{name}.'
+                )
+            source = field.source.replace('.', '__')
+
+            if isinstance(field, serializers.ModelSerializer):
+                nested_class = FastSerializer.for_serializer(type(field))
+                nested = _Plan(
+                    type(field),
+                    nested_class.string_lookups if nested_class else {},
+                    prefix + source + '__',
+                )
+                self.lookups.extend(nested.lookups)
+                self.steps.append((name, None, None, nested))
+                continue
+
+            if isinstance(field, serializers.StringRelatedField):
+                if name not in string_lookups:
+                    raise ImproperlyConfigured(
+                        f'{serializer_class.__name__}.{name} needs an entry in string_lookups.'
+                    )
+                lookup, field = prefix + string_lookups[name], None
+            else:
+                lookup = prefix + source
+            self.lookups.append(lookup)
+            self.steps.append((name, lookup, field, None))
+
+        if prefix:
+            # A null FK makes the whole nested representation None
+            self.presence = prefix + model._meta.pk.name
+            if self.presence not in self.lookups:
+                self.lookups.append(self.presence)
+
+    def bind(self, current_timezone):
+        """Return a row -> dict function with converters resolved for current_timezone"""
+        steps = [
+            (name, lookup,
+             _converter_for(field, current_timezone) if field is not None else None,
+             nested.bind(current_timezone) if nested is not None else None)
+            for name, lookup, field, nested in self.steps
+        ]
+        presence = self.presence
+
+        def build(row):
+            if presence is not None and row[presence] is None:
+                return None
+            data = {}
+            for name, lookup, convert, nested in steps:
+                if nested is not None:
+                    data[name] = nested(row)
+                    continue
+                value = row[lookup]
+                data[name] = value if value is None or convert is None else convert(value)
+            return data
+        return build
+
+
+class FastSerializer:
+    """Read-only serializer that renders `.values()` rows like its DRF counterpart.
+
+    The DRF serializer's fields are compiled once into a list of ORM lookups and
+    per-field converters, so a list response costs one dict build per row instead
+    of a full to_representation() walk. Output is identical to serializer_class.
+    """
+    serializer_class = None
+    # {field name: ORM lookup} for StringRelatedFields, whose str() can't come from .values()
+    string_lookups = {}
+
+    _registry = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.serializer_class is not None and not cls.__dict__.get('_derived', False):
+            FastSerializer._registry[cls.serializer_class] = cls
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        # Pruned subclasses (see sparse_fields) reuse their base's string_lookups
+        for klass in serializer_class.__mro__:
+            if klass in cls._registry:
+                return cls._registry[klass]
+        return None
+
+    @classmethod
+    def for_subclass(cls, serializer_class):
+        """Return a fast serializer for a pruned subclass of serializer_class"""
+        if serializer_class is cls.serializer_class:
+            return cls
+        return _derive_fast_serializer(cls, serializer_class)
+
+    @classmethod
+    def get_plan(cls):
+        if '_plan' not in cls.__dict__:
+            cls._plan = _Plan(cls.serializer_class, cls.string_lookups)
+        return cls._plan
+
+    @classmethod
+    def get_lookups(cls):
+        return list(cls.get_plan().lookups)
+
+    @classmethod
+    def serialize(cls, rows):
+        build = cls.get_plan().bind(timezone.get_current_timezone())
+        return [build(row) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _derive_fast_serializer(fast_serializer_class, serializer_class):
+    return type(fast_serializer_class.__name__, (fast_serializer_class,), {
+        '__module__': fast_serializer_class.__module__,
+        'serializer_class': serializer_class,
+        '_derived': True,
+    })
+
+
+class FastListMixin:
+    """Serve list() through the view's fast_serializer_class when FAST_SERIALIZATION is on"""
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        fast = self.fast_serializer_class
+        if fast is None or not settings.FAST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+
+        fast = fast.for_subclass(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        lookups = fast.get_lookups()
+        # The paginator reads its cursor position from the row, so select the ordering columns too
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'get_ordering'):
+            for field in paginator.get_ordering(request, queryset, self):
+                if field.lstrip('-') not in lookups:
+                    lookups.append(field.lstrip('-'))
+        rows = queryset.values(*lookups)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
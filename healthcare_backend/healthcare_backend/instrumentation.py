@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counters for the request being handled, filled in by the hooks below"""
+    __slots__ = ('queries', 'query_time', 'render_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.query_time += time.perf_counter() - start
+        metrics.queries += 1
+
+
+@receiver(connection_created)
+def install_query_hook(sender, connection, **kwargs):
+    # Stays on the connection for its lifetime; a no-op outside instrumented requests
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@contextmanager
+def timed_render():
+    """Adds the time spent in the block to the current request's render time"""
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.render_time += time.perf_counter() - start
+
+
+class RouteStats:
+    __slots__ = ('requests', 'statuses', 'buckets', 'duration', 'queries', 'query_time',
+                 'render_time', 'over_budget')
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses = {}
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+        self.over_budget = 0
+
+
+class MetricsRegistry:
+    """Per-process totals per (route, method), exported in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, method, status, duration, metrics, over_budget):
+        with self._lock:
+            stats = self._routes.get((route, method))
+            if stats is None:
+                stats = self._routes[(route, method)] = RouteStats()
+            stats.requests += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.buckets[bisect_left(DURATION_BUCKETS, duration)] += 1
+            stats.duration += duration
+            stats.queries += metrics.queries
+            stats.query_time += metrics.query_time
+            stats.render_time += metrics.render_time
+            stats.over_budget += over_budget
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def render(self):
+        with self._lock:
+            routes = sorted(
+                (key, stats, dict(stats.statuses), list(stats.buckets))
+                for key, stats in self._routes.items()
+            )
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        def labels(route, method, **extra):
+            pairs = {'route': route, 'method': method, **extra}
+            return ','.join(f'{key}="{value}"' for key, value in pairs.items())
+
+        family('http_requests_total', 'counter', 'Requests handled, by route, method and status.', [
+            f'http_requests_total{{{labels(route, method, status=status)}}} {count}'
+            for (route, method), _, statuses, _ in routes
+            for status, count in sorted(statuses.items())
+        ])
+        histogram = []
+        for (route, method), stats, _, buckets in routes:
+            cumulative = 0
+            for bound, count in zip((*DURATION_BUCKETS, '+Inf'), buckets):
+                cumulative += count
+                histogram.append(
+                    f'http_request_duration_seconds_bucket{{{labels(route, method, le=bound)}}} {cumulative}'
+                )
+            histogram.append(f'http_request_duration_seconds_sum{{{labels(route, method)}}} {stats.duration:.6f}')
+            histogram.append(f'http_request_duration_seconds_count{{{labels(route, method)}}} {stats.requests}')
+        family('http_request_duration_seconds', 'histogram', 'Time to handle a request.', histogram)
+        for name, kind, help_text, value in (
+            ('http_request_db_queries_total', 'counter', 'Database queries run.',
+             lambda stats: stats.queries),
+            ('http_request_db_seconds_total', 'counter', 'Time spent in database queries.',
+             lambda stats: f'{stats.query_time:.6f}'),
+            ('http_request_render_seconds_total', 'counter', 'Time spent rendering response bodies.',
+             lambda stats: f'{stats.render_time:.6f}'),
+            ('http_request_query_budget_exceeded_total', 'counter',
+             'Requests that ran more than QUERY_COUNT_BUDGET queries (likely N+1).',
+             lambda stats: stats.over_budget),
+        ):
+            family(name, kind, help_text, [
+                f'{name}{{{labels(route, method)}}} {value(stats)}' for (route, method), stats, _, _ in routes
+            ])
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware:
+    """Measure every request: total time, queries and their time, render time.
+
+    Totals go to `registry` (served at /metrics/) keyed by URL name, e.g.
+    `doctor-list-create`. With SERVER_TIMING on, the breakdown is also sent as
+    a Server-Timing header for the browser's network panel. Requests running
+    more than QUERY_COUNT_BUDGET queries are logged as likely N+1s.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Connections opened before this module was imported missed connection_created
+        for connection in connections.all(initialized_only=True):
+            install_query_hook(None, connection)
+        metrics, start = RequestMetrics(), time.perf_counter()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics, start = RequestMetrics(), time.perf_counter()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    def finish(self, request, response, metrics, duration):
+        match = request.resolver_match
+        route = (match.view_name if match else None) or 'unmatched'
+        budget = settings.QUERY_COUNT_BUDGET
+        over_budget = budget is not None and metrics.queries > budget
+        if over_budget:
+            logger.warning(
+                'Likely N+1: %s %s (%s) ran %d queries, budget is %d',
+                request.method, request.path, route, metrics.queries, budget,
+            )
+        registry.record(route, request.method, response.status_code, duration, metrics, over_budget)
+        if settings.SERVER_TIMING:
+            app_time = max(duration - metrics.query_time - metrics.render_time, 0.0)
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics.query_time * 1000:.1f};desc="{metrics.queries} queries"',
+                f'app;dur={app_time * 1000:.1f}',
+                f'render;dur={metrics.render_time * 1000:.1f}',
+                f'total;dur={duration * 1000:.1f}',
+            ])
+        return response
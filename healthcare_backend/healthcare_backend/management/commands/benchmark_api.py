@@ -0,0 +1,195 @@
+import json
+import math
+import subprocess
+import time
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import URLResolver, get_resolver, resolve, reverse
+from users.tokens import ClaimsRefreshToken
+from healthcare_backend.seeding import seed_dataset
+from .seed_data import add_seed_arguments, seed_options
+
+# Query strings some routes need before they do any real work
+QUERY_STRINGS = {
+    'patient-search': {'q': 'patient'},
+    'doctor-search': {'q': 'doctor'},
+}
+SKIPPED_NAMESPACES = {'admin'}
+
+
+def iter_routes(patterns=None):
+    """Yield (name, pattern) for every named URL pattern, following include()s"""
+    for entry in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(entry, URLResolver):
+            if entry.namespace not in SKIPPED_NAMESPACES:
+                yield from iter_routes(entry.url_patterns)
+        elif entry.name:
+            yield entry.name, entry.pattern
+
+
+def route_kwargs(name, pattern, samples):
+    """URL kwargs pointing at seeded rows, or None if the route takes one we can't fill"""
+    kwargs = {}
+    for key in pattern.regex.groupindex:
+        if key == 'format':
+            kwargs[key] = '.json'
+        elif key == 'patient_id':
+            kwargs[key] = samples['patient']
+        elif key == 'pk' and name.split('-')[0] in samples:
+            kwargs[key] = samples[name.split('-')[0]]
+        else:
+            return None
+    return kwargs
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted `values`"""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+class Command(BaseCommand):
+    help = ('Measure p50/p95/p99 latency and query counts of every GET route on a seeded dataset, '
+            'write them as JSON and optionally compare with an earlier run')
+
+    def add_arguments(self, parser):
+        add_seed_arguments(parser)
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per route')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per route first')
+        parser.add_argument('--route', action='append', help='Only these URL names (repeatable)')
+        parser.add_argument('--output', default='benchmark.json', help='Where to write the results')
+        parser.add_argument('--compare', help='Earlier results file to diff against')
+        parser.add_argument(
+            '--threshold', type=float, default=20.0,
+            help='p95 growth (percent) reported as a regression by --compare'
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1.')
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+
+        # Seeded rows are rolled back once the benchmark finishes
+        with transaction.atomic():
+            users = seed_dataset(**seed_options(options))
+            patient = users[0].patients.first()
+            mapping = patient.doctor_mappings.first()
+            samples = {'patient': patient.pk, 'doctor': mapping.doctor_id, 'mapping': mapping.pk}
+            client = Client(
+                HTTP_HOST='localhost',
+                HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(users[0]).access_token}',
+            )
+            routes = self.run_routes(client, samples, options)
+            transaction.set_rollback(True)
+
+        results = {
+            'commit': git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'dataset': seed_options(options),
+            'iterations': options['iterations'],
+            'routes': routes,
+        }
+        with open(options['output'], 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+        if baseline is not None:
+            self.compare(baseline, results, options['threshold'])
+
+    def run_routes(self, client, samples, options):
+        self.stdout.write(f'{"route":<28} {"status":>6} {"queries":>7} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+        routes = {}
+        for name, pattern in iter_routes():
+            if options['route'] and name not in options['route']:
+                continue
+            kwargs = route_kwargs(name, pattern, samples)
+            if kwargs is None:
+                routes[name] = {'skipped': 'needs URL arguments the benchmark cannot fill'}
+                continue
+            path = reverse(name, kwargs=kwargs)
+            match = resolve(path)
+            if match.view_name != name:
+                routes[name] = {'skipped': f'shadowed by {match.view_name}'}
+                continue
+            view_class = getattr(match.func, 'view_class', None)
+            if view_class is not None and not hasattr(view_class, 'get'):
+                routes[name] = {'path': path, 'skipped': 'not readable with GET'}
+                continue
+            routes[name] = result = self.measure(client, path, QUERY_STRINGS.get(name, {}), options)
+            self.stdout.write(
+                f'{name:<28} {result["status"]:>6} {result["queries"]:>7} '
+                f'{result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} {result["p99_ms"]:>8.2f}'
+            )
+        return routes
+
+    def measure(self, client, path, params, options):
+        def fetch():
+            response = client.get(path, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response.status_code
+
+        for _ in range(options['warmup']):
+            fetch()
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        # Counted on a separate request so the timed ones run without the wrapper
+        with connection.execute_wrapper(count):
+            status = fetch()
+
+        latencies = []
+        for _ in range(options['iterations']):
+            start = time.perf_counter()
+            fetch()
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        return {
+            'path': path,
+            'status': status,
+            'queries': len(queries),
+            'mean_ms': round(sum(latencies) / len(latencies), 3),
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+        }
+
+    def compare(self, baseline, results, threshold):
+        self.stdout.write(f'\nCompared with {baseline.get("commit") or "baseline"}:')
+        self.stdout.write(f'{"route":<28} {"queries":>9} {"p95 ms":>19} {"change":>8}')
+        regressions = []
+        for name, new in results['routes'].items():
+            old = baseline['routes'].get(name)
+            if not old or 'skipped' in old or 'skipped' in new:
+                continue
+            change = (new['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0.0
+            line = (f'{name:<28} {old["queries"]:>4}->{new["queries"]:<4} '
+                    f'{old["p95_ms"]:>8.2f}->{new["p95_ms"]:<8.2f} {change:>+7.1f}%')
+            # Query counts are deterministic, so any increase counts; latency only past the threshold
+            if new['queries'] > old['queries'] or change > threshold or new['status'] != old['status']:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        if regressions:
+            raise CommandError(f'Regressions in: {", ".join(regressions)}')
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
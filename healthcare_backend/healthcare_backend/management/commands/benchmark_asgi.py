@@ -0,0 +1,153 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import reverse
+from doctors.models import Doctor
+from users.tokens import ClaimsRefreshToken
+from healthcare_backend.seeding import seed_dataset
+
+ENDPOINTS = {
+    'patients': ('patient-list-create', 'patient-async-list'),
+    'doctors': ('doctor-list-create', 'doctor-async-list'),
+    'mappings': ('mapping-list-create', 'mapping-async-list'),
+}
+
+
+def wsgi_get(handler, environ):
+    """Run one request through the WSGI handler; returns the status code"""
+    status = []
+    body = handler(dict(environ), lambda code, headers: status.append(code))
+    b''.join(body)
+    body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_get(handler, path, query, headers):
+    """Run one request through the ASGI handler the way an ASGI server would"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'root_path': '', 'headers': headers,
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    request_sent = False
+    status = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # The client never disconnects; Django cancels this wait once it has responded
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await handler(scope, receive, send)
+    return status[0]
+
+
+def summarize(label, elapsed, latencies, errors):
+    latencies = sorted(latencies)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return (
+        f'{label:<6} {len(latencies):>8} {errors:>7} {len(latencies) / elapsed:>9.1f} '
+        f'{quantiles[49] * 1000:>8.1f} {quantiles[94] * 1000:>8.1f} {quantiles[98] * 1000:>8.1f}'
+    )
+
+
+class Command(BaseCommand):
+    help = 'Compare sync (WSGI) and async (ASGI) list endpoints under many concurrent clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='mappings')
+        parser.add_argument('--clients', type=int, default=500, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=5000, help='Total requests per mode')
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Sync workers, like gunicorn --workers; ASGI runs on a single event loop'
+        )
+        parser.add_argument('--patients', type=int, default=500, help='Seeded patients')
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stderr.write(
+                f'Warning: running against {connection.vendor}; results are only meaningful on PostgreSQL.'
+            )
+        if connection.in_atomic_block:
+            raise CommandError('Worker threads need committed data; do not run inside a transaction.')
+
+        # Committed (not rolled back) so every worker thread's connection can read it
+        user = seed_dataset(users=1, patients_per_user=options['patients'], doctors=options['patients'])[0]
+        run = user.username.split('_')[1]
+        try:
+            self.run_benchmark(user, options)
+        finally:
+            if not options['keep']:
+                # Cascades to the seeded patients and mappings
+                user.delete()
+                Doctor.objects.filter(license_number__startswith=f'SEED-{run}-').delete()
+
+    def run_benchmark(self, user, options):
+        sync_name, async_name = ENDPOINTS[options['endpoint']]
+        query = f'page_size={options["page_size"]}'
+        token = f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'
+
+        sync_environ = RequestFactory().get(
+            reverse(sync_name) + '?' + query, HTTP_HOST='localhost', HTTP_AUTHORIZATION=token
+        ).environ
+        async_path = reverse(async_name)
+        async_headers = [(b'host', b'localhost'), (b'authorization', token.encode())]
+
+        wsgi, asgi = WSGIHandler(), ASGIHandler()
+        # One warm-up request each so URL resolution, plans and the revocation set are loaded
+        if wsgi_get(wsgi, sync_environ) != 200:
+            raise CommandError(f'{sync_name} did not return 200')
+        if asyncio.run(asgi_get(asgi, async_path, query, async_headers)) != 200:
+            raise CommandError(f'{async_name} did not return 200')
+
+        self.stdout.write(
+            f'{options["clients"]} clients, {options["requests"]} requests per mode, '
+            f'{options["workers"]} WSGI workers, endpoint {options["endpoint"]}'
+        )
+        self.stdout.write(f'{"mode":<6} {"requests":>8} {"errors":>7} {"req/s":>9} '
+                          f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            async def sync_call():
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(pool, wsgi_get, wsgi, sync_environ)
+            self.stdout.write(summarize('wsgi', *asyncio.run(self.drive(sync_call, options))))
+
+        async def async_call():
+            return await asgi_get(asgi, async_path, query, async_headers)
+        self.stdout.write(summarize('asgi', *asyncio.run(self.drive(async_call, options))))
+
+    async def drive(self, call, options):
+        """Closed-loop load: each client sends its next request once the previous one returns"""
+        remaining = options['requests']
+        latencies, errors = [], 0
+
+        async def client():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                status = await call()
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['clients'])))
+        return time.perf_counter() - start, latencies, errors
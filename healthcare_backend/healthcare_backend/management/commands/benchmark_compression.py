@@ -0,0 +1,98 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+from users.tokens import ClaimsRefreshToken
+from healthcare_backend.compression import AVAILABLE, CODECS, compress_sequence
+from healthcare_backend.seeding import seed_dataset
+from .seed_data import add_seed_arguments, seed_options
+
+# (payload name, URL name, query string)
+PAYLOADS = (
+    ('doctors', 'doctor-list-create', {'page_size': 500}),
+    ('mappings', 'mapping-list-create', {'page_size': 500}),
+    ('mapping-export', 'mapping-export', {'output': 'ndjson'}),
+)
+
+
+def cpu_time(iterations, func):
+    """Mean CPU seconds per call, and the last result"""
+    start = time.process_time()
+    for _ in range(iterations):
+        result = func()
+    return (time.process_time() - start) / iterations, result
+
+
+class Command(BaseCommand):
+    help = ('Compress real API payloads with every coding and level, reporting size against CPU time, '
+            'to choose COMPRESSION_LEVELS')
+
+    def add_arguments(self, parser):
+        add_seed_arguments(parser)
+        parser.add_argument('--iterations', type=int, default=5, help='Compressions timed per level')
+        parser.add_argument('--coding', action='append', choices=list(CODECS), help='Only these codings (repeatable)')
+        parser.add_argument('--levels', help='Comma-separated levels to try instead of every valid one')
+        parser.add_argument('--output', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1.')
+        codings = [coding for coding in options['coding'] or CODECS if coding in AVAILABLE]
+        if not codings:
+            raise CommandError('None of the requested codings is installed.')
+        levels = [int(level) for level in options['levels'].split(',')] if options['levels'] else None
+
+        payloads = self.fetch_payloads(options)
+        self.stdout.write(
+            f'{"payload":<15} {"coding":<6} {"level":>5} {"bytes":>10} {"ratio":>7} '
+            f'{"streamed":>10} {"cpu ms":>9} {"MB/s":>8}'
+        )
+        results = []
+        for name, chunks in payloads.items():
+            body = b''.join(chunks)
+            self.stdout.write(f'{name:<15} {"-":<6} {"-":>5} {len(body):>10} {1.0:>7.2f}')
+            for coding in codings:
+                compress, stream_class, valid_levels = CODECS[coding]
+                for level in levels or valid_levels:
+                    if level not in valid_levels:
+                        continue
+                    seconds, compressed = cpu_time(options['iterations'], lambda: compress(body, level))
+                    # What the middleware sends for the export: one flush per chunk
+                    streamed = sum(len(part) for part in compress_sequence(chunks, stream_class(level)))
+                    result = {
+                        'payload': name, 'coding': coding, 'level': level,
+                        'original_bytes': len(body), 'bytes': len(compressed), 'streamed_bytes': streamed,
+                        'ratio': round(len(body) / len(compressed), 3),
+                        'cpu_ms': round(seconds * 1000, 3),
+                        'mb_per_s': round(len(body) / seconds / 1e6, 1) if seconds else None,
+                    }
+                    results.append(result)
+                    self.stdout.write(
+                        f'{name:<15} {coding:<6} {level:>5} {result["bytes"]:>10} {result["ratio"]:>7.2f} '
+                        f'{streamed:>10} {result["cpu_ms"]:>9.2f} {result["mb_per_s"] or 0:>8.1f}'
+                    )
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({'dataset': seed_options(options), 'results': results}, file, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+    def fetch_payloads(self, options):
+        """Uncompressed bodies of the PAYLOADS routes, as the chunks each response produced"""
+        # Seeded rows are rolled back once the payloads are fetched
+        with transaction.atomic():
+            users = seed_dataset(**seed_options(options))
+            client = Client(
+                HTTP_HOST='localhost',
+                HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(users[0]).access_token}',
+                HTTP_ACCEPT_ENCODING='identity',
+            )
+            payloads = {}
+            for name, url_name, params in PAYLOADS:
+                response = client.get(reverse(url_name), params)
+                if response.status_code != 200:
+                    raise CommandError(f'{url_name} answered {response.status_code}.')
+                payloads[name] = list(response.streaming_content) if response.streaming else [response.content]
+            transaction.set_rollback(True)
+        return payloads
@@ -0,0 +1,60 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from patients.models import Patient
+from patients.serializers import PatientSerializer, PatientFastSerializer
+from doctors.models import Doctor
+from doctors.serializers import DoctorSerializer, DoctorFastSerializer
+from mappings.models import PatientDoctorMapping
+from mappings.serializers import PatientDoctorMappingSerializer, PatientDoctorMappingFastSerializer
+from healthcare_backend.eager_loading import eager_load
+from healthcare_backend.seeding import seed_dataset
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF serializers with the fast .values() path on a seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows per model')
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        cases = [
+            ('patients', Patient, PatientSerializer, PatientFastSerializer),
+            ('doctors', Doctor, DoctorSerializer, DoctorFastSerializer),
+            ('mappings', PatientDoctorMapping, PatientDoctorMappingSerializer,
+             PatientDoctorMappingFastSerializer),
+        ]
+
+        # Seeded rows are rolled back once the benchmark finishes
+        with transaction.atomic():
+            seed_dataset(users=10, patients_per_user=rows // 10, doctors=rows, doctors_per_patient=1)
+            self.stdout.write(f'{"model":<10} {"rows":>7} {"drf (s)":>9} {"fast (s)":>9} {"speedup":>8}')
+
+            for name, model, serializer_class, fast_class in cases:
+                queryset = model.objects.order_by('pk')[:rows]
+                slow_time, slow = best_of(repeat, lambda: json.dumps(
+                    serializer_class(eager_load(queryset, serializer_class), many=True).data
+                ))
+                fast_time, fast = best_of(repeat, lambda: json.dumps(
+                    fast_class.serialize(queryset.values(*fast_class.get_lookups()))
+                ))
+                if slow != fast:
+                    raise CommandError(f'{name}: fast output differs from {serializer_class.__name__}')
+                self.stdout.write(
+                    f'{name:<10} {len(json.loads(fast)):>7} {slow_time:>9.3f} {fast_time:>9.3f} '
+                    f'{slow_time / fast_time:>7.1f}x'
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,96 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+from users.models import User
+from patients.views import PatientListCreateView, PatientDetailView
+from doctors.views import DoctorListCreateView, DoctorDetailView
+from mappings.views import MappingListCreateView, MappingDetailView, PatientDoctorsView
+from healthcare_backend.seeding import seed_dataset
+
+
+def view_queryset(view_class, user, **kwargs):
+    """Return the queryset a GET to view_class would run, including pagination ordering"""
+    request = Request(RequestFactory().get('/'))
+    request.user = user
+    view = view_class(request=request, args=(), kwargs=kwargs, format_kwarg=None)
+    queryset = view.filter_queryset(view.get_queryset())
+
+    paginator = view.paginator if 'pk' not in kwargs else None
+    if paginator is not None:
+        ordering = paginator.get_ordering(request, queryset, view)
+        queryset = queryset.order_by(*ordering)[:paginator.page_size + 1]
+    elif 'pk' in kwargs:
+        queryset = queryset.filter(pk=kwargs['pk'])
+    return queryset
+
+
+def sequential_scans(plan):
+    """Return the tables read with a full scan according to an EXPLAIN plan"""
+    if connection.vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\S+)', plan)
+    if connection.vendor == 'sqlite':
+        # "SCAN t USING INDEX ..." walks an index; a bare "SCAN t" reads the table
+        return [
+            match.group(1)
+            for match in re.finditer(r'\bSCAN (\S+)(.*)', plan)
+            if 'USING' not in match.group(2)
+        ]
+    raise CommandError(f'EXPLAIN checks are not supported on {connection.vendor}.')
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the queryset of every API view on a seeded dataset and fail on sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5)
+        parser.add_argument('--patients-per-user', type=int, default=200)
+        parser.add_argument('--doctors', type=int, default=500)
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan')
+
+    def handle(self, *args, **options):
+        failures = []
+        # Everything runs in one transaction that is rolled back at the end
+        with transaction.atomic():
+            users = seed_dataset(
+                users=options['users'],
+                patients_per_user=options['patients_per_user'],
+                doctors=options['doctors'],
+            )
+            user = users[0]
+            patient = user.patients.first()
+            mapping = patient.doctor_mappings.first()
+
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+                if connection.vendor == 'postgresql':
+                    # A seq scan that survives this setting has no usable index
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            checks = {
+                'patient-list-create': view_queryset(PatientListCreateView, user),
+                'patient-detail': view_queryset(PatientDetailView, user, pk=patient.pk),
+                'doctor-list-create': view_queryset(DoctorListCreateView, user),
+                'doctor-detail': view_queryset(DoctorDetailView, user, pk=mapping.doctor_id),
+                'mapping-list-create': view_queryset(MappingListCreateView, user),
+                'mapping-detail': view_queryset(MappingDetailView, user, pk=mapping.pk),
+                'patient-doctors': view_queryset(PatientDoctorsView, user, patient_id=patient.pk),
+                'user_login': User.objects.filter(email=user.email),
+            }
+
+            for name, queryset in checks.items():
+                plan = queryset.explain()
+                scans = sequential_scans(plan)
+                if scans:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f'{name}: sequential scan on {", ".join(scans)}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'{name}: ok'))
+                if scans or options['verbose_plans']:
+                    self.stdout.write(plan)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'Sequential scans found in: {", ".join(failures)}')
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from healthcare_backend.schema import build_artifacts, load_artifacts, source_fingerprint, write_artifacts
+
+
+class Command(BaseCommand):
+    help = 'Write the OpenAPI schema as JSON/YAML (plus gzip/brotli variants) for the schema views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', default=settings.SCHEMA_ARTIFACT_DIR)
+        parser.add_argument(
+            '--force', action='store_true', help='Regenerate even if the sources are unchanged'
+        )
+
+    def handle(self, *args, **options):
+        directory = options['output_dir']
+        fingerprint = source_fingerprint()
+        if not options['force'] and load_artifacts(directory, fingerprint) is not None:
+            self.stdout.write(f'Schema in {directory} is up to date ({fingerprint[:12]})')
+            return
+
+        for path in write_artifacts(directory, build_artifacts(), fingerprint):
+            self.stdout.write(f'Wrote {path} ({path.stat().st_size} bytes)')
+        self.stdout.write(self.style.SUCCESS(f'Schema generated ({fingerprint[:12]})'))
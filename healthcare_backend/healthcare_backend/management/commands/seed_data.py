@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from healthcare_backend.seeding import seed_dataset
+
+
+def add_seed_arguments(parser):
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--patients-per-user', type=int, default=200)
+    parser.add_argument('--doctors', type=int, default=500)
+    parser.add_argument('--doctors-per-patient', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk_create INSERT')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible data')
+
+
+def seed_options(options):
+    return {
+        'users': options['users'],
+        'patients_per_user': options['patients_per_user'],
+        'doctors': options['doctors'],
+        'doctors_per_patient': options['doctors_per_patient'],
+        'batch_size': options['batch_size'],
+        'seed': options['seed'],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Bulk-insert a synthetic dataset of users, patients, doctors and mappings for load testing'
+
+    def add_arguments(self, parser):
+        add_seed_arguments(parser)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            users = seed_dataset(**seed_options(options))
+        patients = len(users) * options['patients_per_user']
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(users)} users, {patients} patients, {options["doctors"]} doctors and '
+            f'{patients * min(options["doctors_per_patient"], options["doctors"])} mappings.'
+        ))
+        # Seeded users share one password, so load tests can log in as any of them
+        self.stdout.write(f'Log in as {users[0].email} / Secure@123')
@@ -0,0 +1,13 @@
+from django.db import migrations
+
+
+class RunSQLOnPostgres(migrations.RunSQL):
+    """RunSQL for PostgreSQL-only objects (extensions, GIN/trigram indexes); a no-op elsewhere"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,151 @@
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Keyset (seek) pagination keyed on the model's Meta.ordering plus the primary key.
+
+    DRF's CursorPagination seeks on the first ordering field only and falls back
+    to OFFSET for ties. Here the cursor stores the full ordering tuple with `id`
+    as tiebreaker, so every position is unique and every page is a plain
+    `WHERE (...) > (...) ORDER BY ... LIMIT n` no matter how deep it is.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = None
+    tiebreak_field = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        # Fall back to the model's default ordering when the view doesn't set one
+        if self.ordering is None:
+            self.ordering = tuple(queryset.model._meta.ordering) or (self.tiebreak_field,)
+        ordering = super().get_ordering(request, queryset, view)
+
+        if self.tiebreak_field not in [field.lstrip('-') for field in ordering]:
+            # Keep the tiebreak in the same direction so one index can serve the scan
+            prefix = '-' if ordering[0].startswith('-') else ''
+            ordering = ordering + (prefix + self.tiebreak_field,)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async twin of paginate_queryset() for views using the async ORM"""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the sliced, ordered and seek-filtered queryset for the requested page"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        current_position = self.cursor.position if self.cursor is not None else None
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self._seek_filter(queryset, ordering, current_position))
+
+        # Fetch one extra row to find out whether another page follows
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        """Work out the page and its next/previous positions from the fetched rows"""
+        reverse = self.cursor is not None and self.cursor.reverse
+        current_position = self.cursor.position if self.cursor is not None else None
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            # Rows were fetched backwards, flip them back before returning
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _seek_filter(self, queryset, ordering, position):
+        """Build `(a, b) > (x, y)` as `a > x OR (a = x AND b > y)` for mixed directions"""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            attr = field.lstrip('-')
+            value = self._to_python(queryset, attr, value)
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            condition |= equal & Q(**{attr + lookup: value})
+            equal &= Q(**{attr: value})
+        return condition
+
+    def _to_python(self, queryset, attr, value):
+        """Parse a cursor value as the ordering field's type; a tampered cursor is a 404, not a 500"""
+        output_field = None
+        if attr in queryset.query.annotations:
+            output_field = queryset.query.annotations[attr].output_field
+        else:
+            try:
+                output_field = queryset.model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                pass
+        if output_field is None:
+            return value
+        try:
+            return output_field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            attr = field.lstrip('-')
+            value = instance[attr] if isinstance(instance, dict) else getattr(instance, attr)
+            values.append(str(value))
+        return json.dumps(values)
+
+
+class RankedCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over an annotated `score`, best match first"""
+    ordering = ('-score',)
@@ -0,0 +1,50 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+from .instrumentation import timed_render
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Anything orjson can't encode natively goes through DRF's own encoder, so
+# Decimal, date/datetime (with the trailing 'Z'), UUIDs, lazy strings etc.
+# come out exactly as they do with the stdlib renderer.
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed.
+
+    Falls back to the stdlib path for pretty-printed output (`; indent=n`, the
+    browsable API), non-compact / ASCII-only / non-strict settings, or when
+    orjson is missing or rejects the data (e.g. integers wider than 64 bits).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed_render():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (orjson is None or self.ensure_ascii or not self.compact or not self.strict
+                or self.get_indent(accepted_media_type, renderer_context) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same \u2028 / \u2029 escaping as JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,249 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+import django
+import drf_yasg
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+API_INFO = openapi.Info(
+    title="Healthcare Backend API",
+    default_version='v1',
+    description="""
+    🏥 **Healthcare Management System API**
+
+    A comprehensive REST API for healthcare management built with Django REST Framework.
+
+    **Features:**
+    - JWT Authentication
+    - User Management (Patient/Doctor roles)
+    - Patient CRUD Operations
+    - Doctor Management
+    - Patient-Doctor Mapping
+
+    **Authentication:**
+    Use the 'Authorize' button below to add your Bearer token for protected endpoints.
+
+    **Created by:** Rahul Kumar
+    - GitHub: https://github.com/RahulK847
+    - Portfolio: https://www.rahulk847.live/
+    """,
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="rahul@example.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+# format -> (codec, file name)
+SCHEMA_FORMATS = {
+    'json': (OpenAPICodecJson, 'openapi.json'),
+    'yaml': (OpenAPICodecYaml, 'openapi.yaml'),
+}
+# content coding -> (compress, file suffix), best first
+ENCODINGS = {
+    'br': (lambda content: brotli.compress(content, quality=11), '.br'),
+    'gzip': (lambda content: gzip.compress(content, compresslevel=9, mtime=0), '.gz'),
+}
+MANIFEST_NAME = 'manifest.json'
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint():
+    """Hash of everything the schema is generated from.
+
+    Covers the project's Python sources (URLconfs, views, serializers, models)
+    outside tests and migrations, the schema settings and the library versions,
+    so the artifacts are rebuilt exactly when one of them changes.
+    """
+    digest = hashlib.sha256()
+    base_dir = Path(settings.BASE_DIR)
+    packages = {base_dir / settings.ROOT_URLCONF.split('.')[0]}
+    packages.update(
+        Path(config.path) for config in apps.get_app_configs()
+        if Path(config.path).is_relative_to(base_dir)
+    )
+    for package in sorted(packages):
+        for path in sorted(package.rglob('*.py')):
+            relative = path.relative_to(base_dir)
+            if 'migrations' in relative.parts or path.name == 'tests.py':
+                continue
+            digest.update(str(relative).encode())
+            digest.update(path.read_bytes())
+    digest.update(repr((
+        django.__version__, rest_framework.__version__, drf_yasg.__version__,
+        settings.REST_FRAMEWORK, getattr(settings, 'SWAGGER_SETTINGS', None),
+    )).encode())
+    return digest.hexdigest()
+
+
+class SchemaArtifact:
+    """One rendered schema document plus its precompressed variants"""
+
+    def __init__(self, content, variants=None):
+        self.content = content
+        self.hash = hashlib.sha256(content).hexdigest()[:32]
+        if variants is None:
+            variants = {
+                coding: compress(content)
+                for coding, (compress, _) in ENCODINGS.items()
+                if coding != 'br' or brotli is not None
+            }
+        self.variants = variants
+
+    def select(self, accept_encoding):
+        """Return (content coding or None, body, strong ETag) for an Accept-Encoding header"""
+        accepted = _accepted_codings(accept_encoding)
+        for coding in ENCODINGS:
+            if coding in accepted and coding in self.variants:
+                # Each coding is a different representation, so it needs its own strong ETag
+                return coding, self.variants[coding], f'"{self.hash}-{coding}"'
+        return None, self.content, f'"{self.hash}"'
+
+
+def _accepted_codings(header):
+    codings = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        params = params.replace(' ', '')
+        if coding and params not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            codings.add(coding.lower())
+    return codings
+
+
+def generate_schema():
+    """Run drf-yasg over the whole URLconf and return the Swagger object"""
+    request = APIView().initialize_request(APIRequestFactory().get('/swagger.json'))
+    # An empty (non-None) url keeps host/schemes out, so the schema works on any domain
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(API_INFO, url='')
+    return generator.get_schema(request=request, public=True)
+
+
+def build_artifacts(schema=None):
+    schema = schema if schema is not None else generate_schema()
+    return {
+        fmt: SchemaArtifact(codec([]).encode(schema))
+        for fmt, (codec, _) in SCHEMA_FORMATS.items()
+    }
+
+
+def write_artifacts(directory, artifacts, fingerprint):
+    """Write each document, its compressed variants and a manifest; returns the paths written"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for fmt, artifact in artifacts.items():
+        name = SCHEMA_FORMATS[fmt][1]
+        files = {name: artifact.content}
+        for coding, body in artifact.variants.items():
+            files[name + ENCODINGS[coding][1]] = body
+        for file_name, body in files.items():
+            (directory / file_name).write_bytes(body)
+            written.append(directory / file_name)
+    manifest = {
+        'fingerprint': fingerprint,
+        'formats': {fmt: sorted(artifact.variants) for fmt, artifact in artifacts.items()},
+    }
+    # Written last, so a half-written directory never looks current
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    written.append(directory / MANIFEST_NAME)
+    return written
+
+
+def load_artifacts(directory, fingerprint):
+    """Read artifacts written by write_artifacts(), or None if missing or stale"""
+    directory = Path(directory)
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text())
+        if manifest.get('fingerprint') != fingerprint:
+            return None
+        artifacts = {}
+        for fmt, codings in manifest['formats'].items():
+            name = SCHEMA_FORMATS[fmt][1]
+            artifacts[fmt] = SchemaArtifact(
+                (directory / name).read_bytes(),
+                {coding: (directory / (name + ENCODINGS[coding][1])).read_bytes() for coding in codings},
+            )
+        return artifacts
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+_artifacts = None
+_artifacts_lock = threading.Lock()
+
+
+def get_artifacts():
+    """Artifacts for this process: read from SCHEMA_ARTIFACT_DIR, or generated once if stale"""
+    global _artifacts
+    if _artifacts is None:
+        with _artifacts_lock:
+            if _artifacts is None:
+                fingerprint = source_fingerprint()
+                artifacts = load_artifacts(settings.SCHEMA_ARTIFACT_DIR, fingerprint)
+                if artifacts is None:
+                    logger.warning(
+                        'OpenAPI schema artifacts are missing or stale; generating in-process. '
+                        'Run `manage.py generate_schema` at build time.'
+                    )
+                    artifacts = build_artifacts()
+                _artifacts = artifacts
+    return _artifacts
+
+
+def reset_artifacts():
+    global _artifacts
+    _artifacts = None
+
+
+# URL format -> (artifact format, content type)
+SCHEMA_RESPONSES = {
+    '.json': ('json', 'application/json'),
+    '.yaml': ('yaml', 'application/yaml'),
+    # Swagger UI and ReDoc fetch `?format=openapi` from their own URL
+    'openapi': ('json', 'application/openapi+json'),
+}
+
+
+def serve_schema(request, format):
+    """Serve a precomputed schema document with a strong ETag and precompressed bodies"""
+    fmt, content_type = SCHEMA_RESPONSES[format]
+    coding, body, etag = get_artifacts()[fmt].select(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type=content_type)
+        if coding:
+            response['Content-Encoding'] = coding
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Accept-Encoding',))
+    # Shared caches may keep it, but must check the ETag after a deploy
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+def with_precomputed_schema(ui_view):
+    """Wrap a drf-yasg UI view so its `?format=openapi` spec fetch is served precomputed"""
+
+    def view(request, *args, **kwargs):
+        if request.GET.get('format') == 'openapi':
+            return serve_schema(request, 'openapi')
+        return ui_view(request, *args, **kwargs)
+    return view
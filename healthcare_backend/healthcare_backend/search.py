@@ -0,0 +1,103 @@
+import operator
+from functools import reduce
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, SearchVectorField, TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import Case, Expression, F, FloatField, Q, TextField, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat, Greatest, Lower
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from .db_routing import ReplicaReadMixin
+from .fast_serializers import FastListMixin
+from .pagination import RankedCursorPagination
+
+MAX_QUERY_LENGTH = 200
+SEARCH_PARAMETER = openapi.Parameter(
+    'q', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+    description='Search text; words may be quoted, `or`-ed or negated with `-`',
+)
+
+
+class SearchDocument(Expression):
+    """Generated-column expression: a weighted full-text document over `fields`.
+
+    Earlier fields weigh more. On PostgreSQL it is a `tsvector`; elsewhere it
+    compiles to the lowercased, space-joined text, which search() matches with
+    LIKE so the same column works in SQLite test runs.
+    """
+    output_field = SearchVectorField()
+    config = 'simple'
+
+    def __init__(self, *fields):
+        super().__init__()
+        self.fields = fields
+        self.vector = reduce(operator.add, [
+            SearchVector(field, weight=weight, config=self.config)
+            for field, weight in zip(fields, 'ABCD')
+        ])
+        parts = [Coalesce(F(field), Value('')) for field in fields]
+        text = reduce(lambda joined, part: joined + [Value(' '), part], parts[1:], parts[:1])
+        self.text = Lower(Concat(*text, output_field=TextField()) if len(text) > 1 else text[0])
+
+    def get_source_expressions(self):
+        return [self.vector, self.text]
+
+    def set_source_expressions(self, exprs):
+        self.vector, self.text = exprs
+
+    def as_sql(self, compiler, connection):
+        return compiler.compile(self.text)
+
+    def as_postgresql(self, compiler, connection):
+        return compiler.compile(self.vector)
+
+
+def search(queryset, text):
+    """Filter to rows matching `text` and annotate the `score` they rank by.
+
+    PostgreSQL matches the GIN-indexed `search_document` with a websearch
+    query, or any field by trigram word similarity so typos still match, and
+    ranks by ts_rank plus the best similarity. Other databases require every
+    term to appear in the document and rank matches on the first field first.
+    """
+    fields = queryset.model._meta.get_field('search_document').expression.fields
+    if connections[queryset.db].vendor == 'postgresql':
+        query = SearchQuery(text, search_type='websearch', config=SearchDocument.config)
+        similarity = [TrigramWordSimilarity(text, field) for field in fields]
+        similarity = Greatest(*similarity, output_field=FloatField()) if len(similarity) > 1 else similarity[0]
+        matches = [Q(search_document=query)] + [Q(TrigramWordSimilar(F(field), text)) for field in fields]
+        # ts_rank is float4 and similarity float8; cast the sum so the ordered value and the
+        # cursor's bound compare as the same type
+        return queryset.annotate(
+            score=Cast(SearchRank(F('search_document'), query) + similarity, FloatField())
+        ).filter(reduce(operator.or_, matches))
+
+    terms = text.lower().split()
+    score = reduce(operator.add, [
+        Case(When(**{f'{fields[0]}__icontains': term}, then=Value(1.0)),
+             default=Value(0.0), output_field=FloatField())
+        for term in terms
+    ])
+    return queryset.annotate(score=score).filter(
+        reduce(operator.and_, [Q(search_document__contains=term) for term in terms])
+    )
+
+
+class SearchListView(ReplicaReadMixin, FastListMixin, generics.ListAPIView):
+    """Ranked, keyset-paginated search over get_queryset() with `?q=`"""
+    pagination_class = RankedCursorPagination
+
+    @swagger_auto_schema(manual_parameters=[SEARCH_PARAMETER])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        text = self.request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({'q': ['This query parameter is required.']})
+        return search(queryset, text[:MAX_QUERY_LENGTH])
@@ -0,0 +1,76 @@
+import random
+import uuid
+from datetime import date, timedelta
+from django.contrib.auth.hashers import make_password
+from users.models import User
+from patients.models import Patient
+from doctors.models import Doctor
+from doctors.availability import sync_availability
+from mappings.models import PatientDoctorMapping
+from mappings.counters import actual_count
+
+SPECIALIZATIONS = [
+    'Cardiology', 'Dermatology', 'Neurology', 'Orthopedics',
+    'Pediatrics', 'Psychiatry', 'Oncology', 'General Medicine',
+]
+GENDERS = ['male', 'female', 'other']
+BLOOD_GROUPS = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
+
+
+def seed_dataset(users=5, patients_per_user=200, doctors=500, doctors_per_patient=3,
+                 batch_size=1000, seed=0):
+    """Bulk-insert a synthetic dataset and return the created users.
+
+    Every row gets a run-specific suffix so the function can be called
+    repeatedly against the same database without hitting unique constraints.
+    """
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8]
+    # Hashing is deliberately slow, so every seeded user shares one hash
+    password = make_password('Secure@123')
+
+    user_rows = User.objects.bulk_create([
+        User(
+            username=f'seed_{run}_{i}', email=f'seed_{run}_{i}@example.com',
+            password=password, role='patient',
+        )
+        for i in range(users)
+    ], batch_size=batch_size)
+
+    doctor_rows = Doctor.objects.bulk_create([
+        Doctor(
+            name=f'Doctor {i:06d}', email=f'doctor_{run}_{i}@example.com',
+            phone='9876543212', specialization=rng.choice(SPECIALIZATIONS),
+            license_number=f'SEED-{run}-{i}', experience_years=rng.randint(0, 40),
+            address='Clinic', consultation_fee=f'{rng.randint(100, 5000)}.00',
+            availability='Mon-Fri 9AM-5PM',
+        )
+        for i in range(doctors)
+    ], batch_size=batch_size)
+    sync_availability(doctor.availability for doctor in doctor_rows)
+
+    per_patient = min(doctors_per_patient, len(doctor_rows))
+    patient_rows = Patient.objects.bulk_create([
+        Patient(
+            created_by=user, name=f'Patient {u}-{i}',
+            email=f'patient_{run}_{u}_{i}@example.com', phone='9876543210',
+            date_of_birth=date(1950, 1, 1) + timedelta(days=rng.randint(0, 25000)),
+            address='Street', gender=rng.choice(GENDERS),
+            blood_group=rng.choice(BLOOD_GROUPS), emergency_contact='9876543211',
+            active_doctor_count=per_patient,
+        )
+        for u, user in enumerate(user_rows)
+        for i in range(patients_per_user)
+    ], batch_size=batch_size)
+
+    PatientDoctorMapping.objects.bulk_create([
+        PatientDoctorMapping(created_by=patient.created_by, patient=patient, doctor=doctor)
+        for patient in patient_rows
+        for doctor in rng.sample(doctor_rows, per_patient)
+    ], batch_size=batch_size)
+    # bulk_create bypasses the counter bookkeeping, so recount this run's doctors in one UPDATE
+    Doctor.objects.filter(license_number__startswith=f'SEED-{run}-').update(
+        active_patient_count=actual_count(Doctor)
+    )
+
+    return user_rows
@@ -0,0 +1,151 @@
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from .eager_loading import get_related_lookups
+
+
+def _is_nested(field):
+    return isinstance(field, serializers.BaseSerializer)
+
+
+def parse_field_list(value):
+    """Turn `id,patient_details.name` into {'id': {}, 'patient_details': {'name': {}}}"""
+    tree = {}
+    for path in value.split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def build_spec(serializer_class, fields=None, expand=None, param='fields'):
+    """Resolve parsed `fields` / `expand` trees against a serializer.
+
+    Returns a hashable tuple of (field name, nested spec or None) pairs in the
+    serializer's own field order, where None keeps the field whole. Without
+    `fields` every plain field is kept; nested serializers are only kept when
+    listed in `fields` or `expand`.
+    """
+    available = {
+        name: field for name, field in serializer_class().fields.items() if not field.write_only
+    }
+    requested = dict(fields or {})
+    for name, children in (expand or {}).items():
+        if name in available and not _is_nested(available[name]):
+            raise ValidationError({'expand': [f'"{name}" is not an expandable field.']})
+        requested.setdefault(name, children)
+
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise ValidationError({param: [f'Unknown field(s): {", ".join(unknown)}.']})
+
+    spec = []
+    for name, field in available.items():
+        if name in requested:
+            children = requested[name]
+            if children and not _is_nested(field):
+                raise ValidationError({param: [f'"{name}" has no nested fields.']})
+            nested = build_spec(type(field), children, param=param) if children else None
+            spec.append((name, nested))
+        elif fields is None and not _is_nested(field):
+            spec.append((name, None))
+    return tuple(spec)
+
+
+@lru_cache(maxsize=256)
+def sparse_serializer(serializer_class, spec):
+    """Subclass serializer_class keeping only the fields named in spec"""
+    attrs = {'__module__': serializer_class.__module__}
+    for name, nested in spec:
+        if nested is not None:
+            # Redeclare the nested serializer with the same arguments, pruned in turn
+            field = serializer_class._declared_fields[name]
+            attrs[name] = sparse_serializer(type(field), nested)(*field._args, **field._kwargs)
+    attrs['Meta'] = type('Meta', (serializer_class.Meta,), {'fields': [name for name, _ in spec]})
+    return type(serializer_class.__name__, (serializer_class,), attrs)
+
+
+@lru_cache(maxsize=256)
+def get_sparse_serializer(serializer_class, fields=None, expand=None):
+    """Pruned serializer for raw `fields` / `expand` query values (None when absent)"""
+    spec = build_spec(
+        serializer_class,
+        parse_field_list(fields) if fields else None,
+        parse_field_list(expand or ''),
+    )
+    return sparse_serializer(serializer_class, spec)
+
+
+@lru_cache(maxsize=256)
+def get_only_fields(serializer_class, prefix=''):
+    """Model field paths a serializer reads, suitable for QuerySet.only()"""
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    paths = [prefix + model._meta.pk.name]
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        name = field.source.split('.')[0]
+        try:
+            model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # A property or method; it may read anything, so load the whole row
+            return ()
+        paths.append(prefix + name)
+        if isinstance(field, serializers.ModelSerializer) and '.' not in field.source:
+            nested = get_only_fields(type(field), prefix + name + '__')
+            if not nested:
+                # Keep the nested row whole rather than deferring everything else
+                continue
+            paths.extend(nested)
+    return tuple(dict.fromkeys(paths))
+
+
+class SparseFieldsMixin:
+    """Sparse fieldsets for read requests: `?fields=id,name` and `?expand=patient_details`.
+
+    `fields` limits the response to the listed fields (dotted names reach into
+    nested serializers); `expand` picks which nested serializers to embed, with
+    `?expand=` embedding none. The serializer is pruned before it is used, so
+    eager loading skips the joins of dropped relations, and the queryset is
+    narrowed with only() to the columns that are still rendered.
+    """
+
+    def is_sparse_request(self):
+        request = getattr(self, 'request', None)
+        if request is None or getattr(self, 'swagger_fake_view', False) or request.method not in ('GET', 'HEAD'):
+            return False
+        return 'fields' in request.query_params or 'expand' in request.query_params
+
+    def get_serializer_class(self):
+        serializer_class = super().get_serializer_class()
+        if not self.is_sparse_request():
+            return serializer_class
+        params = self.request.query_params
+        return get_sparse_serializer(serializer_class, params.get('fields'), params.get('expand'))
+
+    def get_conditional_timestamp_fields(self):
+        fields = super().get_conditional_timestamp_fields()
+        if not self.is_sparse_request():
+            return fields
+        # Relations that are no longer rendered don't change the representation
+        select, _ = get_related_lookups(self.get_serializer_class())
+        return tuple(field for field in fields if field.rpartition('__')[0] in ('', *select))
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.is_sparse_request():
+            return queryset
+        only = get_only_fields(self.get_serializer_class())
+        if not only:
+            return queryset
+        extra = [field for field in self.get_conditional_timestamp_fields() if '__' not in field]
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'get_ordering'):
+            # The paginator reads the cursor position off the last row
+            extra.extend(field.lstrip('-') for field in paginator.get_ordering(self.request, queryset, self))
+        return queryset.only(*only, *extra)
@@ -0,0 +1,425 @@
+import datetime
+import gzip
+import io
+import json
+import tempfile
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipIf
+from zoneinfo import ZoneInfo
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.test import APITestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from users.models import User
+from users.serializers import UserSerializer
+from patients.models import Patient
+from patients.tests import create_patient
+from patients.serializers import PatientSerializer, PatientBulkSerializer, PatientFastSerializer
+from doctors.models import Doctor
+from doctors.tests import create_doctor
+from doctors.serializers import DoctorSerializer, DoctorBulkSerializer, DoctorFastSerializer
+from mappings.models import PatientDoctorMapping
+from mappings.serializers import (
+    PatientDoctorMappingSerializer, PatientDoctorMappingCreateSerializer,
+    PatientDoctorMappingFastSerializer,
+)
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from . import checks, compression, db_routing, instrumentation, schema
+
+
+class ExplainQueriesCommandTests(APITestCase):
+
+    def test_no_sequential_scans_on_view_querysets(self):
+        out = io.StringIO()
+        call_command('explain_queries', users=5, patients_per_user=10, doctors=30, stdout=out)
+        self.assertNotIn('sequential scan', out.getvalue())
+        self.assertEqual(Patient.objects.count(), 0)
+
+
+class BenchmarkApiCommandTests(APITestCase):
+
+    def test_results_cover_routes_and_flag_query_regressions(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        output = Path(directory.name) / 'run.json'
+        options = dict(users=1, patients_per_user=5, doctors=10, iterations=2, warmup=0, stdout=io.StringIO())
+        call_command('benchmark_api', output=str(output), **options)
+        results = json.loads(output.read_text())
+        routes = results['routes']
+        self.assertEqual(routes['mapping-list-create']['status'], 200)
+        self.assertGreater(routes['mapping-list-create']['queries'], 0)
+        self.assertLessEqual(routes['patient-detail']['p50_ms'], routes['patient-detail']['p99_ms'])
+        self.assertEqual(routes['patient-bulk-create']['skipped'], 'not readable with GET')
+        self.assertEqual(Patient.objects.count(), 0)
+
+        routes['mapping-list-create']['queries'] -= 1
+        output.write_text(json.dumps(results))
+        with self.assertRaisesMessage(CommandError, 'mapping-list-create'):
+            call_command('benchmark_api', output=str(Path(directory.name) / 'next.json'),
+                         compare=str(output), route=['mapping-list-create'], threshold=1e9, **options)
+
+
+class FastJSONRoundTripTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123', phone='9876543210'
+        )
+        cls.patient = create_patient(
+            cls.user, 0, name='Zoë   Patient', email='patient@example.com',
+            date_of_birth=datetime.date(1990, 5, 15), address='MG Road', gender='female',
+            blood_group='AB-', medical_history='Unicode ✓ "quoted" \\ backslash',
+        )
+        cls.doctor = create_doctor(
+            0, name='Priya', email='priya@example.com', phone='7654321098',
+            license_number='CARD2025001', experience_years=8, address='AIIMS',
+            consultation_fee=Decimal('1500.50'),
+        )
+        cls.mapping = PatientDoctorMapping.objects.create(
+            created_by=cls.user, patient=cls.patient, doctor=cls.doctor, notes=None
+        )
+
+    def serializer_payloads(self):
+        yield 'UserSerializer', UserSerializer(self.user).data
+        for serializer_class in (PatientSerializer, PatientBulkSerializer):
+            yield serializer_class.__name__, serializer_class(self.patient).data
+        for serializer_class in (DoctorSerializer, DoctorBulkSerializer):
+            yield serializer_class.__name__, serializer_class(self.doctor).data
+        for serializer_class in (PatientDoctorMappingSerializer, PatientDoctorMappingCreateSerializer):
+            yield serializer_class.__name__, serializer_class(self.mapping).data
+        yield 'many=True', PatientDoctorMappingSerializer([self.mapping] * 3, many=True).data
+        for fast, model in ((PatientFastSerializer, Patient), (DoctorFastSerializer, Doctor),
+                            (PatientDoctorMappingFastSerializer, PatientDoctorMapping)):
+            yield fast.__name__, fast.serialize(model.objects.values(*fast.get_lookups()))
+        invalid = DoctorSerializer(data={'experience_years': 500})
+        invalid.is_valid()
+        yield 'validation errors', invalid.errors
+
+    def assertRoundTrip(self, data, label):
+        fast = FastJSONRenderer().render(data)
+        self.assertEqual(fast, JSONRenderer().render(data), label)
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(fast)),
+            JSONParser().parse(io.BytesIO(fast)),
+            label
+        )
+
+    def test_every_serializer_renders_and_parses_identically(self):
+        for label, data in self.serializer_payloads():
+            with self.subTest(label):
+                self.assertRoundTrip(data, label)
+
+    def test_native_types_match_drf_encoder(self):
+        data = {
+            'decimal': Decimal('12.50'),
+            'date': datetime.date(2025, 8, 31),
+            'utc': datetime.datetime(2025, 8, 31, 11, 20, 5, 123456, tzinfo=datetime.timezone.utc),
+            'kolkata': datetime.datetime(2025, 8, 31, 11, 20, tzinfo=ZoneInfo('Asia/Kolkata')),
+            'naive': datetime.datetime(2025, 8, 31, 11, 20),
+            'time': datetime.time(9, 30),
+            'duration': datetime.timedelta(hours=1, seconds=5),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Not found.'),
+            'separators': 'line\u2028paragraph\u2029end',
+            'huge': 2 ** 70,
+            1: 'integer key',
+        }
+        self.assertRoundTrip(data, 'native types')
+
+    def test_falls_back_to_stdlib_without_orjson(self):
+        with mock.patch('healthcare_backend.renderers.orjson', None), \
+                mock.patch('healthcare_backend.parsers.orjson', None):
+            for label, data in self.serializer_payloads():
+                with self.subTest(label):
+                    self.assertRoundTrip(data, label)
+
+    def test_indented_output_matches(self):
+        data = PatientSerializer(self.patient).data
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+        for body in (b'{"name": ', b'{"value": NaN}', b'\xff\xfe'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+
+class PrecomputedSchemaTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        call_command('generate_schema', output_dir=cls.directory.name, stdout=io.StringIO())
+        cls.enterClassContext(override_settings(SCHEMA_ARTIFACT_DIR=cls.directory.name))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        schema.reset_artifacts()
+        self.addCleanup(schema.reset_artifacts)
+
+    def test_generation_is_skipped_when_sources_are_unchanged(self):
+        out = io.StringIO()
+        call_command('generate_schema', output_dir=self.directory.name, stdout=out)
+        self.assertIn('up to date', out.getvalue())
+        self.assertIsNone(schema.load_artifacts(self.directory.name, 'stale'))
+
+    def test_precompressed_variants_with_strong_etags(self):
+        plain = self.client.get('/swagger.json')
+        self.assertEqual(plain['Content-Type'], 'application/json')
+        self.assertIn('/patients/', json.loads(plain.content)['paths'])
+        self.assertNotIn('host', json.loads(plain.content))
+
+        compressed = self.client.get('/swagger.json', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+        cached = self.client.get(
+            '/swagger.json', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=compressed['ETag']
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_ui_spec_fetch_is_served_precomputed(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/swagger/?format=openapi')
+        self.assertEqual(response['Content-Type'], 'application/openapi+json')
+        self.assertEqual(response.content, self.client.get('/swagger.json').content)
+        self.assertEqual(self.client.get('/swagger/').status_code, 200)
+        self.assertEqual(self.client.get('/swagger.yaml')['Content-Type'], 'application/yaml')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1', 'replica_2'], REPLICA_MAX_LAG=5)
+class ReplicaRoutingTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123', phone='9876543210'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.lag = {'replica_1': 0.5, 'replica_2': 0.5}
+        patcher = mock.patch.object(db_routing, 'replica_lag', side_effect=self.lag.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lagging_replicas_are_skipped(self):
+        self.assertIn(db_routing.get_read_alias(self.user), ('replica_1', 'replica_2'))
+        self.lag['replica_1'] = 30
+        self.assertEqual(db_routing.get_read_alias(self.user), 'replica_2')
+        self.lag['replica_2'] = float('inf')
+        self.assertIsNone(db_routing.get_read_alias(self.user))
+
+    def test_router_reads_from_the_picked_alias_outside_transactions(self):
+        router = db_routing.PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Patient), 'default')
+        with db_routing.read_from('replica_2'):
+            self.assertEqual(router.db_for_write(Patient), 'default')
+            # TestCase wraps each test in a transaction, which keeps reads on the primary
+            self.assertEqual(router.db_for_read(Patient), 'default')
+            with mock.patch.object(connection, 'in_atomic_block', False):
+                self.assertEqual(router.db_for_read(Patient), 'replica_2')
+        self.assertEqual(router.db_for_read(Patient), 'default')
+        self.assertFalse(router.allow_migrate('replica_1', 'patients'))
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(db_routing, 'get_read_alias', wraps=db_routing.get_read_alias) as picked:
+            self.assertEqual(self.client.get('/api/patients/').status_code, 200)
+        picked.assert_called_once_with(self.user)
+
+        response = self.client.post('/api/patients/', {
+            'name': 'Asha', 'email': 'asha@example.com', 'phone': '9876543210',
+            'date_of_birth': '1990-05-15', 'address': 'MG Road', 'gender': 'female',
+            'blood_group': 'O+', 'emergency_contact': '9876543211',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(db_routing.is_pinned(self.user))
+        self.assertIsNone(db_routing.get_read_alias(self.user))
+
+    def test_pins_outlast_a_stale_lag_reading(self):
+        with mock.patch.object(cache, 'set') as cache_set, \
+                self.settings(REPLICA_LAG_CHECK_INTERVAL=3, REPLICA_PIN_CACHE='default'):
+            db_routing.pin_to_primary(self.user)
+        cache_set.assert_called_once_with(db_routing._pin_key(self.user), True, 8)
+
+    def test_process_local_pin_cache_fails_the_system_check(self):
+        self.assertEqual([error.id for error in checks.check_replica_pin_cache(None)], ['healthcare_backend.E001'])
+        shared = {**settings.CACHES, 'pins': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        with self.settings(CACHES=shared, REPLICA_PIN_CACHE='pins'):
+            self.assertEqual(checks.check_replica_pin_cache(None), [])
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(checks.check_replica_pin_cache(None), [])
+
+
+class InstrumentationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123', phone='9876543210'
+        )
+
+    def setUp(self):
+        cache.clear()
+        instrumentation.registry.reset()
+        self.client.force_authenticate(self.user)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_reports_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/patients/')
+        self.assertEqual(response.status_code, 200)
+        timing = dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+        self.assertEqual(set(timing), {'db', 'app', 'render', 'total'})
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', timing['db'])
+
+    def test_metrics_are_exported_per_route(self):
+        self.client.get('/api/doctors/')
+        self.client.get('/api/doctors/')
+        with self.settings(METRICS_TOKEN='secret'):
+            body = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret').content.decode()
+        self.assertIn('http_requests_total{route="doctor-list-create",method="GET",status="200"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{route="doctor-list-create",method="GET"} 2', body)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+
+    def test_metrics_are_closed_by_default(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/metrics/').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+    @override_settings(QUERY_COUNT_BUDGET=0)
+    def test_requests_over_the_query_budget_are_flagged(self):
+        with self.assertLogs('healthcare_backend.instrumentation', 'WARNING') as logs:
+            self.client.get('/api/patients/')
+        self.assertIn('Likely N+1: GET /api/patients/ (patient-list-create)', logs.output[0])
+        self.assertIn(
+            'http_request_query_budget_exceeded_total{route="patient-list-create",method="GET"} 1',
+            instrumentation.registry.render(),
+        )
+
+
+class CompressionTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123', phone='9876543210'
+        )
+        for i in range(20):
+            patient = create_patient(cls.user, i)
+            doctor = create_doctor(i)
+            PatientDoctorMapping.objects.create(created_by=cls.user, patient=patient, doctor=doctor)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_negotiation_honours_q_values_and_preference(self):
+        self.assertEqual(compression.choose_coding('gzip, br', ['br', 'gzip']), 'br')
+        self.assertEqual(compression.choose_coding('gzip;q=1.0, br;q=0.5', ['br', 'gzip']), 'gzip')
+        self.assertEqual(compression.choose_coding('br;q=0, *', ['br', 'gzip']), 'gzip')
+        self.assertIsNone(compression.choose_coding('identity', ['br', 'gzip']))
+        self.assertIsNone(compression.choose_coding('', ['br', 'gzip']))
+
+    @override_settings(COMPRESSION_ENCODINGS=['gzip'])
+    def test_json_responses_are_compressed(self):
+        plain = self.client.get('/api/doctors/')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        compressed = self.client.get('/api/doctors/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertEqual(compressed['Content-Length'], str(len(compressed.content)))
+        self.assertEqual(compressed['ETag'], f'{plain["ETag"][:-1]}-gzip"')
+        not_modified = self.client.get(
+            '/api/doctors/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=compressed['ETag']
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+        small = self.client.get('/api/doctors/?page_size=1', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', small)
+
+    @override_settings(COMPRESSION_ENCODINGS=['gzip'], EXPORT_CHUNK_SIZE=5)
+    def test_streaming_exports_are_compressed_per_chunk(self):
+        plain = b''.join(self.client.get('/api/mappings/export/').streaming_content)
+        response = self.client.get('/api/mappings/export/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), plain)
+
+    @skipIf(compression.brotli is None, 'Brotli is not installed')
+    def test_brotli_is_preferred_when_accepted(self):
+        plain = self.client.get('/api/mappings/')
+        response = self.client.get('/api/mappings/', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), plain.content)
+
+    @override_settings(COMPRESSION_ENCODINGS=['gzip'], COMPRESSION_MIN_SIZE=0)
+    def test_compressed_etag_works_for_if_match(self):
+        patient = Patient.objects.first()
+        url = f'/api/patients/{patient.pk}/'
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].endswith('-gzip"'))
+        self.assertFalse(response['ETag'].startswith('W/'))
+        updated = self.client.patch(
+            url, {'name': 'Renamed'}, HTTP_IF_MATCH=response['ETag'], HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(updated.status_code, 200)
+        stale = self.client.patch(url, {'name': 'Again'}, HTTP_IF_MATCH=response['ETag'])
+        self.assertEqual(stale.status_code, 412)
+
+
+class BenchmarkCompressionCommandTests(APITestCase):
+
+    def test_reports_every_requested_level(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        output = Path(directory.name) / 'compression.json'
+        call_command(
+            'benchmark_compression', users=1, patients_per_user=5, doctors=10, iterations=1,
+            coding=['gzip'], levels='1,9', output=str(output), stdout=io.StringIO(),
+        )
+        results = json.loads(output.read_text())['results']
+        self.assertEqual(
+            {(result['payload'], result['level']) for result in results},
+            {(payload, level) for payload in ('doctors', 'mappings', 'mapping-export') for level in (1, 9)},
+        )
+        self.assertTrue(all(result['bytes'] < result['original_bytes'] for result in results))
+        self.assertEqual(Patient.objects.count(), 0)
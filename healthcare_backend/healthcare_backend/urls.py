@@ -18,37 +18,12 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from . import views
+from .schema import API_INFO, serve_schema, with_precomputed_schema
 
-# Swagger schema view
+# Swagger schema view; the spec itself is served from precomputed artifacts (see schema.py)
 schema_view = get_schema_view(
-    openapi.Info(
-        title="Healthcare Backend API",
-        default_version='v1',
-        description="""
-        🏥 **Healthcare Management System API**
-        
-        A comprehensive REST API for healthcare management built with Django REST Framework.
-        
-        **Features:**
-        - JWT Authentication
-        - User Management (Patient/Doctor roles)
-        - Patient CRUD Operations
-        - Doctor Management
-        - Patient-Doctor Mapping
-        
-        **Authentication:**
-        Use the 'Authorize' button below to add your Bearer token for protected endpoints.
-        
-        **Created by:** Rahul Kumar
-        - GitHub: https://github.com/RahulK847
-        - Portfolio: https://www.rahulk847.live/
-        """,
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="rahul@example.com"),
-        license=openapi.License(name="MIT License"),
-    ),
+    API_INFO,
     public=True,
     permission_classes=(permissions.AllowAny,),
 )
@@ -57,12 +32,13 @@ urlpatterns = [
     # Documentation
     path('', views.api_documentation, name='api_docs'),  # Custom HTML docs with Swagger button
     path('docs/', views.api_documentation, name='api_documentation'),  # Alternative docs URL
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    path('swagger/', with_precomputed_schema(schema_view.with_ui('swagger', cache_timeout=0)), name='schema-swagger-ui'),
+    path('redoc/', with_precomputed_schema(schema_view.with_ui('redoc', cache_timeout=0)), name='schema-redoc'),
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', serve_schema, name='schema-json'),
     
     # Health check and admin
     path('health/', views.health_check, name='health_check'),  
+    path('metrics/', views.metrics, name='metrics'),
     path('admin/', admin.site.urls),
     
     # API endpoints
@@ -70,4 +46,5 @@ urlpatterns = [
     path('api/patients/', include('patients.urls')),
     path('api/doctors/', include('doctors.urls')),
     path('api/mappings/', include('mappings.urls')),
+    path('api/sync/', include('sync.urls')),
 ]
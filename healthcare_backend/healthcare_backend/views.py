@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from .instrumentation import registry
 
 def api_documentation(request):
 
@@ -7,3 +10,11 @@ def api_documentation(request):
 
 def health_check(request):
     return HttpResponse("Healthcare Backend API is running! 🏥", content_type="text/plain")
+
+def metrics(request):
+    # Closed unless the scraper sends the METRICS_TOKEN bearer or a staff user is logged in
+    token = settings.METRICS_TOKEN
+    authorized = token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not (authorized or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
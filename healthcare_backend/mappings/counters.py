@@ -0,0 +1,124 @@
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from patients.models import Patient
+from doctors.models import Doctor
+from doctors.signals import invalidate_doctor_cache
+from sync.models import Tombstone
+from .models import PatientDoctorMapping
+from .upsert import upsert_mappings
+from .events import CREATED, DEACTIVATED, publish_mapping_events
+
+# model -> (counter field, mapping FK to the model)
+COUNTERS = {
+    Patient: ('active_doctor_count', 'patient'),
+    Doctor: ('active_patient_count', 'doctor'),
+}
+# Models whose updated_at moves with their counter. A patient is only seen by its owner, so its
+# ETag and sync position follow the count. Doctors are shared by every user: re-stamping them, or
+# flushing the directory cache, on each assignment would empty that cache under normal traffic and
+# re-send the doctor to every sync client, so their count reaches cached payloads, ETags and the
+# sync feed on the doctor's next write or once the entries expire (DOCTOR_CACHE_TIMEOUT)
+STAMPED = (Patient,)
+
+
+def _stamp(model, now):
+    return {'updated_at': now} if model in STAMPED else {}
+
+
+def adjust_counts(patient_id, doctor_id, delta):
+    """Add `delta` to one patient's and one doctor's active-mapping counters in the database"""
+    now = timezone.now()
+    # Always patient first, so concurrent adjustments lock rows in the same order
+    Patient.objects.filter(pk=patient_id).update(
+        active_doctor_count=F('active_doctor_count') + delta, **_stamp(Patient, now)
+    )
+    Doctor.objects.filter(pk=doctor_id).update(
+        active_patient_count=F('active_patient_count') + delta, **_stamp(Doctor, now)
+    )
+
+
+def adjust_counts_many(mappings, delta):
+    """adjust_counts() for many mappings: one UPDATE per model and distinct per-row change"""
+    now = timezone.now()
+    # COUNTERS lists Patient first, the same lock order as adjust_counts()
+    for model, (field, foreign_key) in COUNTERS.items():
+        per_row = Counter(getattr(mapping, f'{foreign_key}_id') for mapping in mappings)
+        by_change = defaultdict(list)
+        for pk, count in per_row.items():
+            by_change[count * delta].append(pk)
+        for change, pks in by_change.items():
+            model.objects.filter(pk__in=pks).update(**{field: F(field) + change}, **_stamp(model, now))
+
+
+def create_mapping(serializer, **kwargs):
+    with transaction.atomic():
+        mapping = serializer.save(**kwargs)
+        if mapping.is_active:
+            adjust_counts(mapping.patient_id, mapping.doctor_id, 1)
+            publish_mapping_events(CREATED, [mapping])
+    return mapping
+
+
+def create_mappings(created_by, pairs, notes=None):
+    """Assign many (patient_id, doctor_id) pairs; returns the created or reactivated mappings"""
+    with transaction.atomic():
+        mappings = upsert_mappings(created_by, pairs, notes)
+        if mappings:
+            adjust_counts_many(mappings, 1)
+            publish_mapping_events(CREATED, mappings)
+    return mappings
+
+
+def deactivate_mapping(mapping):
+    """Soft-delete a mapping; returns False if it was already inactive"""
+    with transaction.atomic():
+        # Only the request that flips is_active may decrement
+        deactivated = PatientDoctorMapping.objects.filter(pk=mapping.pk, is_active=True).update(
+            is_active=False, updated_at=timezone.now()
+        )
+        if deactivated:
+            adjust_counts(mapping.patient_id, mapping.doctor_id, -1)
+            # Sync clients see a soft delete as a deletion
+            Tombstone.record('mappings', mapping.pk, mapping.created_by_id)
+            publish_mapping_events(DEACTIVATED, [mapping])
+    return bool(deactivated)
+
+
+def actual_count(model):
+    """Subquery expression counting the active mappings of each `model` row"""
+    _, foreign_key = COUNTERS[model]
+    active = (
+        PatientDoctorMapping.objects
+        .filter(is_active=True, **{foreign_key: OuterRef('pk')})
+        .order_by()
+        .values(foreign_key)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(active), Value(0))
+
+
+def find_drift(model):
+    """(pk, stored, actual) for every `model` row whose counter is wrong"""
+    field, _ = COUNTERS[model]
+    return list(
+        model.objects.annotate(actual=actual_count(model))
+        .exclude(**{field: F('actual')})
+        .order_by('pk')
+        .values_list('pk', field, 'actual')
+    )
+
+
+def repair_drift(model, pks):
+    """Recount the given rows in a single UPDATE; returns the number of rows updated"""
+    field, _ = COUNTERS[model]
+    # Recomputed inside the UPDATE, so writes since find_drift() are not overwritten
+    updated = model.objects.filter(pk__in=pks).update(
+        **{field: actual_count(model)}, updated_at=timezone.now()
+    )
+    if updated and model is Doctor:
+        invalidate_doctor_cache(sender=Doctor)
+    return updated
@@ -0,0 +1,19 @@
+from django.db import transaction
+from healthcare_backend.events import broker
+
+CREATED = 'mapping.created'
+DEACTIVATED = 'mapping.deactivated'
+
+
+def publish_mapping_events(event, mappings):
+    """Tell the owners' open event streams about `mappings` once the transaction commits"""
+    payloads = [
+        (mapping.created_by_id, {'id': mapping.pk, 'patient': mapping.patient_id, 'doctor': mapping.doctor_id})
+        for mapping in mappings
+    ]
+
+    def publish():
+        for user_id, data in payloads:
+            broker.publish(user_id, event, data)
+
+    transaction.on_commit(publish)
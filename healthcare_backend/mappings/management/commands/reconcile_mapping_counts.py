@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from mappings.counters import COUNTERS, find_drift, repair_drift
+
+
+class Command(BaseCommand):
+    help = 'Recount active mappings per patient and per doctor and repair counters that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        total = 0
+        for model, (field, _) in COUNTERS.items():
+            drift = find_drift(model)
+            total += len(drift)
+            label = model._meta.verbose_name_plural
+            for pk, stored, actual in drift:
+                self.stdout.write(f'{model._meta.object_name} {pk}: {field} {stored} -> {actual}')
+            if drift and not options['dry_run']:
+                repaired = sum(
+                    repair_drift(model, [pk for pk, _, _ in drift[start:start + 1000]])
+                    for start in range(0, len(drift), 1000)
+                )
+                self.stdout.write(f'Repaired {repaired} {label}.')
+            else:
+                self.stdout.write(f'{len(drift)} {label} drifted.')
+        if total and options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{total} counters drifted (dry run, nothing changed).'))
+        elif not total:
+            self.stdout.write(self.style.SUCCESS('All counters are accurate.'))
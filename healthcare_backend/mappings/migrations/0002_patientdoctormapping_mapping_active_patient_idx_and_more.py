@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0002_doctor_doctor_name_idx'),
+        ('mappings', '0001_initial'),
+        ('patients', '0003_patient_patient_owner_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='patientdoctormapping',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['patient', '-assigned_date', '-id'], name='mapping_active_patient_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patientdoctormapping',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-assigned_date', '-id'], name='mapping_active_assigned_idx'),
+        ),
+    ]
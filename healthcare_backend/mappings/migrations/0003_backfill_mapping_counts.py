@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:30
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    Mapping = apps.get_model('mappings', 'PatientDoctorMapping')
+    for model_name, field, foreign_key in (
+        ('patients.Patient', 'active_doctor_count', 'patient'),
+        ('doctors.Doctor', 'active_patient_count', 'doctor'),
+    ):
+        active = (
+            Mapping.objects.filter(is_active=True, **{foreign_key: OuterRef('pk')})
+            .order_by().values(foreign_key).annotate(count=Count('pk')).values('count')
+        )
+        apps.get_model(model_name).objects.update(**{field: Coalesce(Subquery(active), Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0003_doctor_active_patient_count'),
+        ('mappings', '0002_patientdoctormapping_mapping_active_patient_idx_and_more'),
+        ('patients', '0004_patient_active_doctor_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0006_doctor_updated_index'),
+        ('mappings', '0003_backfill_mapping_counts'),
+        ('patients', '0006_patient_updated_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='patientdoctormapping',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_by', 'updated_at', 'id'], name='mapping_active_updated_idx'),
+        ),
+    ]
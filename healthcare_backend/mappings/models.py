@@ -36,6 +36,25 @@ class PatientDoctorMapping(models.Model):
         # Prevent duplicate mappings for the same patient-doctor pair
         unique_together = ['patient', 'doctor']
         ordering = ['-assigned_date']
+        indexes = [
+            # Only active mappings are ever listed, so keep the index to those rows
+            models.Index(
+                fields=['patient', '-assigned_date', '-id'],
+                condition=models.Q(is_active=True),
+                name='mapping_active_patient_idx',
+            ),
+            models.Index(
+                fields=['-assigned_date', '-id'],
+                condition=models.Q(is_active=True),
+                name='mapping_active_assigned_idx',
+            ),
+            # Delta sync reads one user's active mappings keyset on (updated_at, id)
+            models.Index(
+                fields=['created_by', 'updated_at', 'id'],
+                condition=models.Q(is_active=True),
+                name='mapping_active_updated_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.patient.name} → Dr. {self.doctor.name}"
\ No newline at end of file
@@ -1,9 +1,12 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from .models import PatientDoctorMapping
+from .upsert import upsert_mapping
 from patients.models import Patient
 from doctors.models import Doctor
 from patients.serializers import PatientSerializer
 from doctors.serializers import DoctorSerializer
+from healthcare_backend.fast_serializers import FastSerializer
 
 class PatientDoctorMappingSerializer(serializers.ModelSerializer):
     created_by = serializers.StringRelatedField(read_only=True)
@@ -50,27 +53,57 @@ class PatientDoctorMappingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = PatientDoctorMapping
         fields = ['patient', 'doctor', 'notes']
+        # The upsert in create() enforces the unique pair; no UniqueTogetherValidator query
+        validators = []
     
     def validate(self, data):
         """Custom validation for patient-doctor mapping"""
         patient = data.get('patient')
-        doctor = data.get('doctor')
         request = self.context.get('request')
         
         # Ensure the patient belongs to the authenticated user
-        if patient and patient.created_by != request.user:
+        if patient and patient.created_by_id != request.user.pk:
             raise serializers.ValidationError(
                 "You can only assign doctors to patients you created."
             )
         
-        # Check if mapping already exists
-        if PatientDoctorMapping.objects.filter(
-            patient=patient, 
-            doctor=doctor, 
-            is_active=True
-        ).exists():
-            raise serializers.ValidationError(
-                "This patient is already assigned to this doctor."
-            )
-        
-        return data
\ No newline at end of file
+        return data
+
+    def create(self, validated_data):
+        # Inserts, or reactivates a soft-deleted pair, in one statement
+        mapping = upsert_mapping(**validated_data)
+        if mapping is None:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ["This patient is already assigned to this doctor."]
+            })
+        return mapping
+
+class MappingBatchSerializer(serializers.Serializer):
+    """One patient with many doctors, or one doctor with many patients"""
+    MAX_PAIRS = 1000
+
+    patient = serializers.IntegerField(min_value=1, required=False)
+    doctors = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=MAX_PAIRS
+    )
+    doctor = serializers.IntegerField(min_value=1, required=False)
+    patients = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=MAX_PAIRS
+    )
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, data):
+        # Plain IDs: ownership and existence are checked for the whole batch in the view
+        if set(data) - {'notes'} == {'patient', 'doctors'}:
+            data['pairs'] = [(data['patient'], doctor) for doctor in dict.fromkeys(data['doctors'])]
+        elif set(data) - {'notes'} == {'doctor', 'patients'}:
+            data['pairs'] = [(patient, data['doctor']) for patient in dict.fromkeys(data['patients'])]
+        else:
+            raise serializers.ValidationError("Send either `patient` with `doctors` or `doctor` with `patients`.")
+        return data
+
+class PatientDoctorMappingFastSerializer(FastSerializer):
+    """Read-only fast path with the same output as PatientDoctorMappingSerializer"""
+    serializer_class = PatientDoctorMappingSerializer
+    # User.__str__ returns the email
+    string_lookups = {'created_by': 'created_by__email'}
@@ -0,0 +1,22 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from patients.models import Patient
+from doctors.models import Doctor
+from .models import PatientDoctorMapping
+from .counters import COUNTERS, adjust_counts_many
+
+
+@receiver(pre_delete, sender=Patient)
+@receiver(pre_delete, sender=Doctor)
+def release_counts(sender, instance, **kwargs):
+    """A deleted patient or doctor frees the slots of the active mappings its cascade removes.
+
+    Counted here rather than per mapping in post_delete, so the cascade stays a
+    single fast DELETE and the counters take one UPDATE per distinct change.
+    """
+    _, foreign_key = COUNTERS[sender]
+    mappings = list(
+        PatientDoctorMapping.objects.filter(is_active=True, **{foreign_key: instance}).only('patient', 'doctor')
+    )
+    if mappings:
+        adjust_counts_many(mappings, -1)
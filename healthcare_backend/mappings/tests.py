@@ -1,3 +1,470 @@
-from django.test import TestCase
+import asyncio
+import json
+from unittest import mock
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.test import AsyncClient
+from rest_framework.test import APITestCase
+from users.models import User
+from users.tokens import ClaimsRefreshToken
+from patients.models import Patient
+from patients.tests import create_patient
+from doctors.models import Doctor
+from doctors.tests import create_doctor
+from healthcare_backend.eager_loading import get_related_lookups
+from healthcare_backend.events import broker
+from .models import PatientDoctorMapping
+from .counters import find_drift
+from doctors import cache as doctor_cache
+from .serializers import PatientDoctorMappingSerializer, PatientDoctorMappingFastSerializer
 
-# Create your tests here.
+
+def create_mappings(user, count, offset=0):
+    """Create `count` patients each assigned to their own doctor"""
+    for i in range(offset, offset + count):
+        PatientDoctorMapping.objects.create(
+            created_by=user, patient=create_patient(user, i), doctor=create_doctor(i)
+        )
+
+
+class EagerLoadingTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_lookups_derived_from_nested_serializers(self):
+        select, prefetch = get_related_lookups(PatientDoctorMappingSerializer)
+        self.assertEqual(
+            set(select), {'created_by', 'patient', 'patient__created_by', 'doctor'}
+        )
+        self.assertEqual(prefetch, ())
+
+    def test_mapping_list_query_count_is_constant(self):
+        url = reverse('mapping-list-create')
+        create_mappings(self.user, 2)
+        small = self.count_queries(url)
+        create_mappings(self.user, 20, offset=2)
+        self.assertEqual(self.count_queries(url), small)
+
+    def test_mapping_detail_uses_single_query(self):
+        create_mappings(self.user, 1)
+        mapping = PatientDoctorMapping.objects.get()
+        url = reverse('mapping-detail', args=[mapping.pk])
+        self.assertEqual(self.count_queries(url), 1)
+
+
+class MappingBatchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        create_mappings(self.user, 12)
+        call_command('reconcile_mapping_counts', stdout=StringIO())
+        self.patient = Patient.objects.get(email='patient0@example.com')
+        self.doctors = list(Doctor.objects.order_by('license_number').values_list('pk', flat=True))
+        self.url = reverse('mapping-batch')
+
+    def test_one_patient_to_many_doctors(self):
+        # doctors[0] is already assigned to patient 0; doctors[1] was, then removed
+        PatientDoctorMapping.objects.create(
+            created_by=self.user, patient=self.patient, doctor_id=self.doctors[1], is_active=False
+        )
+        wanted = [self.doctors[0], self.doctors[1], self.doctors[2], self.doctors[3], 99999, self.doctors[2]]
+        response = self.client.post(self.url, {'patient': self.patient.pk, 'doctors': wanted, 'notes': 'Care team'},
+                                    format='json')
+        self.assertEqual(response.status_code, 207, response.content)
+        self.assertEqual((response.data['created'], response.data['reactivated']), (2, 1))
+        self.assertEqual(
+            [(result['doctor'], result['status']) for result in response.data['results']],
+            [(self.doctors[0], 'already_assigned'), (self.doctors[1], 'reactivated'),
+             (self.doctors[2], 'created'), (self.doctors[3], 'created'), (99999, 'doctor_not_found')]
+        )
+        self.assertEqual(PatientDoctorMapping.objects.filter(patient=self.patient, is_active=True).count(), 4)
+        self.assertEqual(find_drift(Patient), [])
+        self.assertEqual(find_drift(Doctor), [])
+
+    def test_one_doctor_to_many_patients_checks_ownership(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='Secure@123')
+        foreign = create_patient(other, 'foreign', name='Foreign', email='foreign@example.com')
+        patients = list(Patient.objects.filter(created_by=self.user).values_list('pk', flat=True)[1:4])
+        response = self.client.post(self.url, {'doctor': self.doctors[0], 'patients': [*patients, foreign.pk]},
+                                    format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ['created', 'created', 'created', 'patient_not_found'])
+        self.assertEqual(Doctor.objects.get(pk=self.doctors[0]).active_patient_count, 4)
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        def count(doctors):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url, {'patient': self.patient.pk, 'doctors': doctors}, format='json')
+            self.assertEqual(response.status_code, 201)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count(self.doctors[1:3]), count(self.doctors[3:12]))
+
+    def test_payload_must_name_one_direction(self):
+        response = self.client.post(self.url, {'patient': self.patient.pk, 'patients': [1]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class MappingExportTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_export_streams_flat_rows_in_one_query(self):
+        create_mappings(self.user, 5)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('mapping-export'))
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(lines), 5)
+        row = json.loads(lines[0])
+        self.assertEqual(row['patient_name'], 'Patient 4')
+        self.assertEqual(row['created_by'], 'owner@example.com')
+
+
+class FastSerializationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        create_mappings(self.user, 4)
+        Patient.objects.filter(name='Patient 1').update(blood_group='AB-', medical_history='Asthma')
+
+    def test_fast_list_output_is_byte_identical(self):
+        for name in ('mapping-list-create', 'patient-list-create', 'doctor-list-create'):
+            url = reverse(name) + '?page_size=3'
+            doctor_cache.get_cache().clear()
+            with self.settings(FAST_SERIALIZATION=True):
+                fast = self.client.get(url)
+            doctor_cache.get_cache().clear()
+            with self.settings(FAST_SERIALIZATION=False):
+                slow = self.client.get(url)
+            self.assertEqual(fast.status_code, 200)
+            self.assertEqual(fast.content, slow.content, name)
+
+    def test_fast_serializer_matches_model_serializer(self):
+        queryset = PatientDoctorMapping.objects.order_by('id')
+        fast = PatientDoctorMappingFastSerializer.serialize(
+            queryset.values(*PatientDoctorMappingFastSerializer.get_lookups())
+        )
+        slow = PatientDoctorMappingSerializer(queryset, many=True).data
+        self.assertEqual(json.dumps(fast), json.dumps(slow))
+
+
+class SparseFieldsTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        create_mappings(self.user, 3)
+        self.url = reverse('mapping-list-create')
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, ' '.join(query['sql'] for query in ctx.captured_queries)
+
+    def test_empty_expand_drops_nested_details_and_joins(self):
+        for fast in (True, False):
+            with self.settings(FAST_SERIALIZATION=fast):
+                response, sql = self.get(self.url + '?expand=')
+            row = response.data['results'][0]
+            self.assertNotIn('patient_details', row)
+            self.assertNotIn('doctor_details', row)
+            self.assertEqual(row['created_by'], 'owner@example.com')
+            self.assertNotIn('doctors_doctor', sql)
+            self.assertNotIn('medical_history', sql)
+
+    def test_fields_prune_nested_serializers_and_columns(self):
+        url = self.url + '?fields=id,patient_details.name,patient_details.email'
+        for fast in (True, False):
+            with self.settings(FAST_SERIALIZATION=fast):
+                response, sql = self.get(url)
+            self.assertEqual(
+                list(response.data['results'][0]), ['id', 'patient_details']
+            )
+            self.assertEqual(
+                set(response.data['results'][0]['patient_details']), {'name', 'email'}
+            )
+            self.assertNotIn('medical_history', sql)
+            self.assertNotIn('doctors_doctor', sql)
+
+    def test_sparse_detail_and_pagination_stay_single_query(self):
+        mapping = PatientDoctorMapping.objects.order_by('id').first()
+        url = reverse('mapping-detail', args=[mapping.pk]) + '?fields=id,notes'
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data, {'id': mapping.pk, 'notes': None})
+
+        with self.settings(FAST_SERIALIZATION=False):
+            page = self.client.get(self.url + '?fields=id&page_size=2')
+            with CaptureQueriesContext(connection) as ctx:
+                following = self.client.get(page.data['next'])
+        self.assertEqual(len(following.data['results']), 1)
+        # Cursor ordering columns are loaded up front, not per row
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_unknown_fields_are_rejected(self):
+        for query in ('fields=id,secret', 'expand=notes', 'fields=notes.length'):
+            response = self.client.get(f'{self.url}?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_doctor_detail_cache_is_keyed_per_fieldset(self):
+        doctor = Doctor.objects.order_by('id').first()
+        url = reverse('doctor-detail', args=[doctor.pk])
+        self.assertIn('license_number', self.client.get(url).data)
+        self.assertEqual(self.client.get(url + '?fields=name').data, {'name': doctor.name})
+
+
+class MappingCounterTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        create_mappings(self.user, 2)
+        call_command('reconcile_mapping_counts', stdout=StringIO())
+        self.patient = Patient.objects.get(email='patient0@example.com')
+        self.doctor = Doctor.objects.get(license_number='LIC-1')
+
+    def assertCounts(self, patient_count, doctor_count):
+        self.patient.refresh_from_db()
+        self.doctor.refresh_from_db()
+        self.assertEqual(self.patient.active_doctor_count, patient_count)
+        self.assertEqual(self.doctor.active_patient_count, doctor_count)
+
+    def test_create_and_soft_delete_adjust_counters_once(self):
+        response = self.client.post(
+            reverse('mapping-list-create'), {'patient': self.patient.pk, 'doctor': self.doctor.pk}
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertCounts(2, 2)
+        detail = self.client.get(reverse('doctor-detail', args=[self.doctor.pk]))
+        self.assertEqual(detail.data['active_patient_count'], 2)
+
+        url = reverse('mapping-detail', args=[PatientDoctorMapping.objects.latest('id').pk])
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertCounts(1, 1)
+        detail = self.client.get(reverse('patient-detail', args=[self.patient.pk]))
+        self.assertEqual(detail.data['active_doctor_count'], 1)
+
+    def test_assignments_leave_the_doctor_directory_cached(self):
+        generation = doctor_cache.get_generation()
+        stamped = Doctor.objects.get(pk=self.doctor.pk).updated_at
+        response = self.client.post(
+            reverse('mapping-list-create'), {'patient': self.patient.pk, 'doctor': self.doctor.pk}
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        mapping = PatientDoctorMapping.objects.get(patient=self.patient, doctor=self.doctor)
+        self.assertEqual(self.client.delete(reverse('mapping-detail', args=[mapping.pk])).status_code, 204)
+        self.assertEqual(doctor_cache.get_generation(), generation)
+        self.doctor.refresh_from_db()
+        self.assertEqual(self.doctor.updated_at, stamped)
+        self.assertGreater(Patient.objects.get(pk=self.patient.pk).updated_at, stamped)
+
+    def test_soft_deleted_pair_is_reactivated(self):
+        mapping = PatientDoctorMapping.objects.get(patient=self.patient)
+        self.assertEqual(self.client.delete(reverse('mapping-detail', args=[mapping.pk])).status_code, 204)
+        self.assertEqual(Patient.objects.get(pk=self.patient.pk).active_doctor_count, 0)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('mapping-list-create'), {
+                'patient': self.patient.pk, 'doctor': mapping.doctor_id, 'notes': 'Follow-up',
+            })
+        self.assertEqual(response.status_code, 201, response.content)
+        mapping.refresh_from_db()
+        self.assertEqual((mapping.is_active, mapping.notes), (True, 'Follow-up'))
+        self.assertEqual(PatientDoctorMapping.objects.filter(patient=self.patient).count(), 1)
+        self.assertEqual(Patient.objects.get(pk=self.patient.pk).active_doctor_count, 1)
+        self.assertEqual(Doctor.objects.get(pk=mapping.doctor_id).active_patient_count, 1)
+        # No pre-check: the mapping table is only touched by the upsert itself
+        mapping_queries = [query['sql'] for query in ctx.captured_queries
+                           if 'mappings_patientdoctormapping' in query['sql']]
+        self.assertEqual(len(mapping_queries), 1)
+        self.assertIn('ON CONFLICT', mapping_queries[0])
+
+    def test_active_pair_is_rejected_without_changes(self):
+        mapping = PatientDoctorMapping.objects.get(patient=self.patient)
+        response = self.client.post(reverse('mapping-list-create'), {
+            'patient': self.patient.pk, 'doctor': mapping.doctor_id, 'notes': 'Again',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'non_field_errors': ['This patient is already assigned to this doctor.']})
+        mapping.refresh_from_db()
+        self.assertIsNone(mapping.notes)
+        self.assertCounts(1, 1)
+
+    def test_cascading_delete_releases_the_doctor(self):
+        Patient.objects.get(email='patient1@example.com').delete()
+        self.assertCounts(1, 0)
+
+    def test_cascading_delete_releases_patients_in_bulk(self):
+        PatientDoctorMapping.objects.create(created_by=self.user, patient=self.patient, doctor=self.doctor)
+        call_command('reconcile_mapping_counts', stdout=StringIO())
+        with CaptureQueriesContext(connection) as ctx:
+            self.doctor.delete()
+        updates = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('UPDATE')]
+        # One UPDATE per model and distinct change, however many mappings the cascade removes
+        self.assertEqual(len(updates), 2)
+        self.patient.refresh_from_db()
+        self.assertEqual(self.patient.active_doctor_count, 1)
+        self.assertEqual(Patient.objects.get(email='patient1@example.com').active_doctor_count, 0)
+
+    def test_reconcile_repairs_drift(self):
+        Doctor.objects.filter(pk=self.doctor.pk).update(active_patient_count=7)
+        out = StringIO()
+        call_command('reconcile_mapping_counts', '--dry-run', stdout=out)
+        self.assertIn(f'Doctor {self.doctor.pk}: active_patient_count 7 -> 1', out.getvalue())
+        self.assertCounts(1, 7)
+
+        call_command('reconcile_mapping_counts', stdout=StringIO())
+        self.assertCounts(1, 1)
+        out = StringIO()
+        call_command('reconcile_mapping_counts', stdout=out)
+        self.assertIn('All counters are accurate.', out.getvalue())
+
+
+class AsyncReadViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        create_mappings(self.user, 3)
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def test_async_views_match_sync_payloads(self):
+        mapping = PatientDoctorMapping.objects.order_by('id').first()
+        pairs = [
+            ('mapping-list-create', 'mapping-async-list', []),
+            ('patient-list-create', 'patient-async-list', []),
+            ('doctor-list-create', 'doctor-async-list', []),
+            ('mapping-detail', 'mapping-async-detail', [mapping.pk]),
+            ('patient-detail', 'patient-async-detail', [mapping.patient_id]),
+            ('doctor-detail', 'doctor-async-detail', [mapping.doctor_id]),
+        ]
+        for sync_name, async_name, args in pairs:
+            with self.subTest(async_name):
+                sync = self.client.get(reverse(sync_name, args=args) + '?page_size=2', **self.auth)
+                response = self.client.get(reverse(async_name, args=args) + '?page_size=2', **self.auth)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response.content.replace(b'/async/', b'/'), sync.content
+                )
+
+    def test_cursor_pages_and_errors(self):
+        url = reverse('mapping-async-list') + '?page_size=2'
+        first = self.client.get(url, **self.auth).json()
+        second = self.client.get(first['next'], **self.auth).json()
+        self.assertEqual(len(first['results']) + len(second['results']), 3)
+        self.assertIsNone(second['next'])
+
+        missing = self.client.get(reverse('mapping-async-detail', args=[0]), **self.auth)
+        self.assertEqual(missing.status_code, 404)
+        anonymous = self.client.get(url)
+        self.assertEqual(anonymous.status_code, 401)
+        self.assertEqual(anonymous['WWW-Authenticate'], 'Bearer realm="api"')
+
+    async def test_served_through_asgi_handler(self):
+        client = AsyncClient()
+        response = await client.get(
+            reverse('patient-async-list'), headers={'Authorization': self.auth['HTTP_AUTHORIZATION']}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+
+
+class MappingEventStreamTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    async def open_stream(self):
+        response = await AsyncClient().get(
+            reverse('mapping-events'), headers={'Authorization': self.auth['HTTP_AUTHORIZATION']}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b': connected\n\n')
+        return stream
+
+    async def test_published_events_reach_the_users_stream(self):
+        stream = await self.open_stream()
+        self.assertEqual(broker.subscriber_count(self.user.pk), 1)
+        broker.publish(self.user.pk + 1, 'mapping.created', {'id': 99})
+        broker.publish(self.user.pk, 'mapping.created', {'id': 1, 'patient': 2, 'doctor': 3})
+        event = await anext(stream)
+        self.assertIn(b'event: mapping.created\n', event)
+        self.assertIn(b'data: {"id":1,"patient":2,"doctor":3}\n\n', event)
+        # A client disconnect cancels the task streaming the response
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(broker.subscriber_count(self.user.pk), 0)
+
+    async def test_slow_subscriber_is_disconnected(self):
+        stream = broker.stream('slow', maxsize=2)
+        self.assertEqual(await anext(stream), b': connected\n\n')
+        for i in range(3):
+            broker.publish('slow', 'mapping.created', {'id': i})
+        self.assertIn(b'event: overflow\n', await anext(stream))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(broker.subscriber_count('slow'), 0)
+
+    def test_mapping_changes_are_published_on_commit(self):
+        create_mappings(self.user, 1)
+        mapping = PatientDoctorMapping.objects.get()
+        PatientDoctorMapping.objects.update(is_active=False)
+        with mock.patch.object(broker, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(
+                    reverse('mapping-list-create'), {'patient': mapping.patient_id, 'doctor': mapping.doctor_id},
+                    **self.auth
+                )
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.delete(reverse('mapping-detail', args=[mapping.pk]), **self.auth)
+        payload = {'id': mapping.pk, 'patient': mapping.patient_id, 'doctor': mapping.doctor_id}
+        self.assertEqual(publish.call_args_list, [
+            mock.call(self.user.pk, 'mapping.created', payload),
+            mock.call(self.user.pk, 'mapping.deactivated', payload),
+        ])
+
+    def test_wsgi_requests_are_refused(self):
+        response = self.client.get(reverse('mapping-events'), **self.auth)
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(self.client.get(reverse('mapping-events')).status_code, 401)
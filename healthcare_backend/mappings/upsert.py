@@ -0,0 +1,82 @@
+from django.db import NotSupportedError, connections, router
+from django.utils import timezone
+from .models import PatientDoctorMapping
+
+# Columns a reassignment overwrites; created_at keeps the first assignment
+REACTIVATED_FIELDS = ('created_by', 'notes', 'is_active', 'assigned_date', 'updated_at')
+
+
+def _convert(connection, fields, row):
+    # What the ORM does to fetched values (e.g. SQLite returns datetimes as text)
+    values = []
+    for field, value in zip(fields, row):
+        column = field.get_col(field.model._meta.db_table)
+        for converter in connection.ops.get_db_converters(column) + field.get_db_converters(connection):
+            value = converter(value, column, connection)
+        values.append(value)
+    return values
+
+
+def upsert_mappings(created_by, pairs, notes=None):
+    """Assign (patient_id, doctor_id) pairs in one INSERT ... ON CONFLICT statement.
+
+    New pairs are inserted and soft-deleted ones reactivated; pairs that are
+    already active are left untouched. Returns the inserted or reactivated
+    mappings, so a pair missing from the result was already assigned. The
+    unique (patient, doctor) index decides, which keeps concurrent
+    assignments of the same pair from both succeeding.
+    """
+    if not pairs:
+        return []
+    db = router.db_for_write(PatientDoctorMapping)
+    connection = connections[db]
+    if not (connection.features.supports_update_conflicts_with_target
+            and connection.features.can_return_rows_from_bulk_insert):
+        raise NotSupportedError(f'Mapping upserts need ON CONFLICT ... RETURNING, which {connection.vendor} lacks.')
+
+    opts = PatientDoctorMapping._meta
+    quote = connection.ops.quote_name
+
+    def column(name):
+        return quote(opts.get_field(name).column)
+
+    table = quote(opts.db_table)
+    now = timezone.now()
+    values = {
+        'created_by': created_by.pk, 'notes': notes, 'is_active': True,
+        'assigned_date': now, 'created_at': now, 'updated_at': now,
+    }
+    inserted = [opts.get_field(name) for name in ('patient', 'doctor', *values)]
+    fixed = [opts.get_field(name).get_db_prep_save(value, connection) for name, value in values.items()]
+    returned = opts.concrete_fields
+    insert = f'INSERT INTO {table} ({", ".join(quote(field.column) for field in inserted)})'
+    # Only inactive rows are updated; an active pair makes the statement return nothing for it
+    conflict = (
+        f'ON CONFLICT ({column("patient")}, {column("doctor")}) DO UPDATE SET '
+        + ', '.join(f'{column(name)} = EXCLUDED.{column(name)}' for name in REACTIVATED_FIELDS)
+        + f' WHERE NOT {table}.{column("is_active")}'
+        + f' RETURNING {", ".join(quote(field.column) for field in returned)}'
+    )
+    row = f'({", ".join(["%s"] * len(inserted))})'
+
+    # A pair may appear once per statement; batches stay within the backend's parameter limit
+    pairs = list(dict.fromkeys(pairs))
+    batch_size = connection.ops.bulk_batch_size(inserted, pairs)
+    names = [field.attname for field in returned]
+    mappings = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            params = [param for patient_id, doctor_id in batch for param in (patient_id, doctor_id, *fixed)]
+            cursor.execute(f'{insert} VALUES {", ".join([row] * len(batch))} {conflict}', params)
+            mappings.extend(
+                PatientDoctorMapping.from_db(db, names, _convert(connection, returned, result))
+                for result in cursor.fetchall()
+            )
+    return mappings
+
+
+def upsert_mapping(created_by, patient, doctor, notes=None):
+    """Assign one pair; returns the mapping, or None if it was already active"""
+    mappings = upsert_mappings(created_by, [(patient.pk, doctor.pk)], notes)
+    return mappings[0] if mappings else None
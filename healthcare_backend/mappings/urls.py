@@ -1,8 +1,16 @@
 from django.urls import path
-from .views import MappingListCreateView, MappingDetailView, PatientDoctorsView
+from .views import (
+    MappingListCreateView, MappingDetailView, PatientDoctorsView, MappingExportView,
+    MappingAsyncListView, MappingAsyncDetailView, MappingBatchView, MappingEventStreamView,
+)
 
 urlpatterns = [
     path('', MappingListCreateView.as_view(), name='mapping-list-create'),
+    path('batch/', MappingBatchView.as_view(), name='mapping-batch'),
+    path('export/', MappingExportView.as_view(), name='mapping-export'),
+    path('events/', MappingEventStreamView.as_view(), name='mapping-events'),
+    path('async/', MappingAsyncListView.as_view(), name='mapping-async-list'),
+    path('async/<int:pk>/', MappingAsyncDetailView.as_view(), name='mapping-async-detail'),
     path('<int:pk>/', MappingDetailView.as_view(), name='mapping-detail'),
     path('<int:patient_id>/', PatientDoctorsView.as_view(), name='patient-doctors'),
 ]
\ No newline at end of file
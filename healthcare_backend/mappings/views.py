@@ -3,16 +3,34 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from .models import PatientDoctorMapping
-from .serializers import PatientDoctorMappingSerializer, PatientDoctorMappingCreateSerializer
+from .counters import create_mapping, create_mappings, deactivate_mapping
+from .serializers import (
+    PatientDoctorMappingSerializer, PatientDoctorMappingCreateSerializer, PatientDoctorMappingFastSerializer,
+    MappingBatchSerializer,
+)
 from patients.models import Patient
+from doctors.models import Doctor
+from healthcare_backend.eager_loading import EagerLoadingMixin
+from healthcare_backend.conditional import ConditionalGetMixin
+from healthcare_backend.export import StreamingExportView
+from healthcare_backend.fast_serializers import FastListMixin
+from healthcare_backend.sparse_fields import SparseFieldsMixin
+from healthcare_backend.db_routing import ReplicaReadMixin
+from healthcare_backend.async_views import AsyncListView, AsyncDetailView, EventStreamView
 
-class MappingListCreateView(generics.ListCreateAPIView):
+# Nested patient/doctor details are part of a mapping's representation
+MAPPING_TIMESTAMP_FIELDS = ('updated_at', 'patient__updated_at', 'doctor__updated_at')
+
+class MappingListCreateView(ReplicaReadMixin, SparseFieldsMixin, EagerLoadingMixin, ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
+    serializer_class = PatientDoctorMappingSerializer
     permission_classes = [IsAuthenticated]
+    fast_serializer_class = PatientDoctorMappingFastSerializer
+    conditional_timestamp_fields = MAPPING_TIMESTAMP_FIELDS
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return PatientDoctorMappingCreateSerializer
-        return PatientDoctorMappingSerializer
+        return super().get_serializer_class()
     
     def get_queryset(self):
         # Return only mappings for patients created by the authenticated user
@@ -22,14 +40,18 @@ class MappingListCreateView(generics.ListCreateAPIView):
         )
     
     def perform_create(self, serializer):
-        # Set the authenticated user as the creator
-        serializer.save(created_by=self.request.user)
+        # Set the authenticated user as the creator; bumps the patient's and doctor's counters
+        create_mapping(serializer, created_by=self.request.user)
 
-class MappingDetailView(generics.RetrieveDestroyAPIView):
+class MappingDetailView(ReplicaReadMixin, SparseFieldsMixin, EagerLoadingMixin, ConditionalGetMixin, generics.RetrieveDestroyAPIView):
     serializer_class = PatientDoctorMappingSerializer
     permission_classes = [IsAuthenticated]
+    conditional_timestamp_fields = MAPPING_TIMESTAMP_FIELDS
     
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            # Schema generation runs without a user; the model is all it needs
+            return PatientDoctorMapping.objects.none()
         # Return only mappings for patients created by the authenticated user
         return PatientDoctorMapping.objects.filter(
             patient__created_by=self.request.user
@@ -37,15 +59,66 @@ class MappingDetailView(generics.RetrieveDestroyAPIView):
     
     def destroy(self, request, *args, **kwargs):
         mapping = self.get_object()
-        # Soft delete by setting is_active to False
-        mapping.is_active = False
-        mapping.save()
+        # Soft delete by setting is_active to False, releasing the counters once
+        deactivate_mapping(mapping)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-class PatientDoctorsView(generics.ListAPIView):
+class MappingBatchView(ReplicaReadMixin, generics.GenericAPIView):
+    """Assign one patient to many doctors, or one doctor to many patients, with per-pair outcomes.
+
+    Ownership and existence are checked with one query per side, and every
+    valid pair is written by the same upsert as single assignments, so
+    soft-deleted pairs are reactivated and active ones reported as such.
+    """
+    serializer_class = MappingBatchSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        pairs = serializer.validated_data['pairs']
+
+        owned = set(Patient.objects.filter(
+            pk__in={patient for patient, _ in pairs}, created_by=request.user
+        ).values_list('pk', flat=True))
+        doctors = set(Doctor.objects.filter(
+            pk__in={doctor for _, doctor in pairs}
+        ).values_list('pk', flat=True))
+        outcomes = {}
+        for patient, doctor in pairs:
+            # Other users' patients look missing, as on the single-row endpoints
+            if patient not in owned:
+                outcomes[(patient, doctor)] = {'status': 'patient_not_found'}
+            elif doctor not in doctors:
+                outcomes[(patient, doctor)] = {'status': 'doctor_not_found'}
+
+        valid = [pair for pair in pairs if pair not in outcomes]
+        for mapping in create_mappings(request.user, valid, serializer.validated_data.get('notes')):
+            # A reactivated row keeps its original created_at
+            outcome = 'created' if mapping.created_at == mapping.assigned_date else 'reactivated'
+            outcomes[(mapping.patient_id, mapping.doctor_id)] = {'status': outcome, 'id': mapping.pk}
+
+        results = [
+            {'patient': patient, 'doctor': doctor, **outcomes.get((patient, doctor), {'status': 'already_assigned'})}
+            for patient, doctor in pairs
+        ]
+        counts = {outcome: sum(result['status'] == outcome for result in results)
+                  for outcome in ('created', 'reactivated')}
+        succeeded = counts['created'] + counts['reactivated']
+        if succeeded == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif succeeded:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({**counts, 'results': results}, status=response_status)
+
+class PatientDoctorsView(ReplicaReadMixin, SparseFieldsMixin, EagerLoadingMixin, ConditionalGetMixin, FastListMixin, generics.ListAPIView):
     """Get all doctors assigned to a specific patient"""
     serializer_class = PatientDoctorMappingSerializer
+    fast_serializer_class = PatientDoctorMappingFastSerializer
     permission_classes = [IsAuthenticated]
+    conditional_timestamp_fields = MAPPING_TIMESTAMP_FIELDS
     
     def get_queryset(self):
         patient_id = self.kwargs['patient_id']
@@ -58,4 +131,41 @@ class PatientDoctorsView(generics.ListAPIView):
         return PatientDoctorMapping.objects.filter(
             patient=patient,
             is_active=True
-        )
\ No newline at end of file
+        )
+
+class MappingExportView(StreamingExportView):
+    """Stream the user's active mappings as flat NDJSON or CSV rows"""
+    permission_classes = [IsAuthenticated]
+    export_name = 'mappings'
+    export_fields = (
+        ('id', 'id'),
+        ('patient', 'patient_id'), ('patient_name', 'patient__name'),
+        ('patient_email', 'patient__email'),
+        ('doctor', 'doctor_id'), ('doctor_name', 'doctor__name'),
+        ('doctor_specialization', 'doctor__specialization'),
+        ('notes', 'notes'), ('is_active', 'is_active'), ('assigned_date', 'assigned_date'),
+        ('created_by', 'created_by__email'), ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    )
+
+    def get_queryset(self):
+        return PatientDoctorMapping.objects.filter(
+            patient__created_by=self.request.user,
+            is_active=True
+        ).order_by('-assigned_date', '-id')
+
+class MappingAsyncListView(AsyncListView):
+    """Async twin of the active mapping list (GET only)"""
+    fast_serializer_class = PatientDoctorMappingFastSerializer
+
+    def get_queryset(self, user):
+        return PatientDoctorMapping.objects.filter(patient__created_by=user, is_active=True)
+
+class MappingAsyncDetailView(AsyncDetailView):
+    fast_serializer_class = PatientDoctorMappingFastSerializer
+
+    def get_queryset(self, user):
+        return PatientDoctorMapping.objects.filter(patient__created_by=user)
+
+class MappingEventStreamView(EventStreamView):
+    """SSE stream of the user's mapping.created / mapping.deactivated events (ASGI only)"""
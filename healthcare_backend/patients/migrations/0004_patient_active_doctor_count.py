@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0003_patient_patient_owner_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='active_doctor_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
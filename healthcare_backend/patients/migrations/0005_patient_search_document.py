@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:31
+
+import django.contrib.postgres.search
+import healthcare_backend.search
+from healthcare_backend.migration_operations import RunSQLOnPostgres
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0004_patient_active_doctor_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='search_document',
+            field=models.GeneratedField(db_persist=True, expression=healthcare_backend.search.SearchDocument('name', 'email', 'phone'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        # Full-text and trigram (typo-tolerant) matching for /search/
+        RunSQLOnPostgres(
+            sql=[
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+                "CREATE INDEX patient_search_document_idx ON patients_patient USING gin (search_document);",
+                "CREATE INDEX patient_name_trgm_idx ON patients_patient USING gin (name gin_trgm_ops);",
+                "CREATE INDEX patient_email_trgm_idx ON patients_patient USING gin (email gin_trgm_ops);",
+                "CREATE INDEX patient_phone_trgm_idx ON patients_patient USING gin (phone gin_trgm_ops);",
+            ],
+            reverse_sql=[
+                "DROP INDEX IF EXISTS patient_search_document_idx;",
+                "DROP INDEX IF EXISTS patient_name_trgm_idx;",
+                "DROP INDEX IF EXISTS patient_email_trgm_idx;",
+                "DROP INDEX IF EXISTS patient_phone_trgm_idx;",
+            ],
+        ),
+    ]
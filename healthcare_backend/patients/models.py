@@ -1,5 +1,7 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
+from healthcare_backend.search import SearchDocument
 
 class Patient(models.Model):
     # User who created this patient record
@@ -40,12 +42,28 @@ class Patient(models.Model):
     emergency_contact = models.CharField(max_length=15)
     medical_history = models.TextField(blank=True, null=True)
     
+    # Maintained by mappings.counters; repair with `manage.py reconcile_mapping_counts`
+    active_doctor_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Full-text document for /search/ (GIN-indexed on PostgreSQL)
+    search_document = models.GeneratedField(
+        expression=SearchDocument('name', 'email', 'phone'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serves the per-user list: filter on created_by, keyset on (-created_at, -id)
+            models.Index(fields=['created_by', '-created_at', '-id'], name='patient_owner_created_idx'),
+            # Delta sync reads one owner's rows keyset on (updated_at, id)
+            models.Index(fields=['created_by', 'updated_at', 'id'], name='patient_owner_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.email}"
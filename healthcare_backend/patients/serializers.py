@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Patient
+from healthcare_backend.fast_serializers import FastSerializer
 
 class PatientSerializer(serializers.ModelSerializer):
     created_by = serializers.StringRelatedField(read_only=True)
@@ -9,8 +10,18 @@ class PatientSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'email', 'phone', 'date_of_birth', 
             'address', 'gender', 'blood_group', 'emergency_contact', 
-            'medical_history', 'created_by', 'created_at', 'updated_at'
+            'medical_history', 'active_doctor_count', 'created_by', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
-        
-    
\ No newline at end of file
+        read_only_fields = ['id', 'active_doctor_count', 'created_by', 'created_at', 'updated_at']
+
+class PatientBulkSerializer(PatientSerializer):
+    """Row serializer for bulk uploads; email uniqueness is checked per batch by the view"""
+
+    class Meta(PatientSerializer.Meta):
+        extra_kwargs = {'email': {'validators': []}}
+
+class PatientFastSerializer(FastSerializer):
+    """Read-only fast path with the same output as PatientSerializer"""
+    serializer_class = PatientSerializer
+    # User.__str__ returns the email
+    string_lookups = {'created_by': 'created_by__email'}
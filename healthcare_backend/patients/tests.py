@@ -1,3 +1,168 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import date
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from users.models import User
+from .models import Patient
 
-# Create your tests here.
+
+def create_patient(user, index, **overrides):
+    data = {
+        'created_by': user, 'name': f'Patient {index}', 'email': f'patient{index}@example.com',
+        'phone': '9876543210', 'date_of_birth': date(1990, 1, 1), 'address': 'Street',
+        'gender': 'male', 'emergency_contact': '9876543211',
+    }
+    data.update(overrides)
+    return Patient.objects.create(**data)
+
+
+class PatientConditionalRequestTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        self.patient = create_patient(self.user, 1)
+        self.detail_url = reverse('patient-detail', args=[self.patient.pk])
+
+    def test_list_returns_304_for_matching_etag(self):
+        url = reverse('patient-list-create')
+        response = self.client.get(url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        # Only the validator aggregate runs, not the page query
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        create_patient(self.user, 2)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_detail_returns_304_for_matching_etag(self):
+        response = self.client.get(self.detail_url)
+        cached = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_update_with_stale_if_match_is_rejected(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        first = self.client.patch(
+            self.detail_url, {'name': 'First'}, format='json', HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(first.status_code, 200)
+        self.assertNotEqual(first['ETag'], etag)
+
+        second = self.client.patch(
+            self.detail_url, {'name': 'Second'}, format='json', HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(second.status_code, 412)
+        self.patient.refresh_from_db()
+        self.assertEqual(self.patient.name, 'First')
+
+
+class PatientBulkCreateTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        create_patient(self.user, 0)
+
+    def row(self, index, **overrides):
+        data = {
+            'name': f'Patient {index}', 'email': f'patient{index}@example.com',
+            'phone': '9876543210', 'date_of_birth': '1990-01-01', 'address': 'Street',
+            'gender': 'female', 'emergency_contact': '9876543211',
+        }
+        data.update(overrides)
+        return data
+
+    def test_bulk_create_reports_per_row_errors(self):
+        rows = [
+            self.row(1),
+            self.row(0),                 # email already in the database
+            self.row(2, gender='robot'), # invalid choice
+            self.row(3),
+            self.row(4, email='patient3@example.com'),  # duplicate within the upload
+        ]
+        response = self.client.post(reverse('patient-bulk-create'), rows, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 4])
+        self.assertEqual(
+            set(Patient.objects.filter(pk__in=response.data['ids']).values_list('email', flat=True)),
+            {'patient1@example.com', 'patient3@example.com'}
+        )
+        self.assertTrue(Patient.objects.filter(created_by=self.user, email='patient1@example.com').exists())
+
+    def test_bulk_create_rejects_non_array_body(self):
+        response = self.client.post(reverse('patient-bulk-create'), self.row(1), format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class PatientExportTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='Secure@123'
+        )
+        self.client.force_authenticate(self.user)
+        for i in range(3):
+            create_patient(self.user, i)
+        create_patient(other, 99)
+
+    def read(self, output):
+        response = self.client.get(reverse('patient-export'), {'output': output})
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_matches_serializer_output(self):
+        rows = [json.loads(line) for line in self.read('ndjson').splitlines()]
+        listed = self.client.get(reverse('patient-list-create')).data['results']
+        self.assertEqual(rows, [dict(patient) for patient in listed])
+
+    def test_csv_export_has_header_and_one_row_per_patient(self):
+        rows = list(csv.reader(io.StringIO(self.read('csv'))))
+        self.assertEqual(rows[0][:3], ['id', 'name', 'email'])
+        self.assertEqual(len(rows), 4)
+
+    def test_accept_header_picks_the_format(self):
+        for accept, content_type in (('text/csv', 'text/csv'), ('application/x-ndjson', 'application/x-ndjson')):
+            with self.subTest(accept):
+                response = self.client.get(reverse('patient-export'), HTTP_ACCEPT=accept)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], content_type)
+        body = b''.join(self.client.get(reverse('patient-export'), HTTP_ACCEPT='text/csv').streaming_content)
+        self.assertEqual(body.decode(), self.read('csv'))
+
+        error = self.client.get(reverse('patient-export'), {'output': 'xml'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(error.status_code, 400)
+        self.assertEqual(error['Content-Type'], 'application/json')
+
+    def test_unknown_output_is_rejected(self):
+        response = self.client.get(reverse('patient-export'), {'output': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+class PatientSearchTests(APITestCase):
+
+    def test_search_is_scoped_to_the_owner(self):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='Secure@123')
+        other = User.objects.create_user(username='other', email='other@example.com', password='Secure@123')
+        create_patient(owner, 1, name='Asha Verma', phone='9123456780')
+        create_patient(owner, 2, name='Rohan Mehta', email='asha.mehta@example.com')
+        create_patient(other, 3, name='Asha Rao')
+        self.client.force_authenticate(owner)
+
+        response = self.client.get(reverse('patient-search'), {'q': 'asha'})
+        self.assertEqual([p['name'] for p in response.data['results']], ['Asha Verma', 'Rohan Mehta'])
+        response = self.client.get(reverse('patient-search'), {'q': '91234'})
+        self.assertEqual([p['name'] for p in response.data['results']], ['Asha Verma'])
@@ -1,7 +1,15 @@
 from django.urls import path
-from .views import PatientListCreateView, PatientDetailView
+from .views import (
+    PatientListCreateView, PatientDetailView, PatientBulkCreateView, PatientExportView,
+    PatientAsyncListView, PatientAsyncDetailView, PatientSearchView,
+)
 
 urlpatterns = [
     path('', PatientListCreateView.as_view(), name='patient-list-create'),
     path('<int:pk>/', PatientDetailView.as_view(), name='patient-detail'),
+    path('bulk/', PatientBulkCreateView.as_view(), name='patient-bulk-create'),
+    path('search/', PatientSearchView.as_view(), name='patient-search'),
+    path('export/', PatientExportView.as_view(), name='patient-export'),
+    path('async/', PatientAsyncListView.as_view(), name='patient-async-list'),
+    path('async/<int:pk>/', PatientAsyncDetailView.as_view(), name='patient-async-detail'),
 ]
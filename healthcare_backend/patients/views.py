@@ -2,10 +2,19 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Patient
-from .serializers import PatientSerializer
+from .serializers import PatientSerializer, PatientBulkSerializer, PatientFastSerializer
+from healthcare_backend.conditional import ConditionalGetMixin
+from healthcare_backend.bulk import BulkCreateAPIView
+from healthcare_backend.export import StreamingExportView
+from healthcare_backend.fast_serializers import FastListMixin
+from healthcare_backend.sparse_fields import SparseFieldsMixin
+from healthcare_backend.db_routing import ReplicaReadMixin
+from healthcare_backend.async_views import AsyncListView, AsyncDetailView
+from healthcare_backend.search import SearchListView
 
-class PatientListCreateView(generics.ListCreateAPIView):
+class PatientListCreateView(ReplicaReadMixin, SparseFieldsMixin, ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = PatientSerializer
+    fast_serializer_class = PatientFastSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -16,10 +25,62 @@ class PatientListCreateView(generics.ListCreateAPIView):
         # Set the authenticated user as the creator of the patient
         serializer.save(created_by=self.request.user)
     
-class PatientDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PatientDetailView(ReplicaReadMixin, SparseFieldsMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = PatientSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            # Schema generation runs without a user; the model is all it needs
+            return Patient.objects.none()
         # Only return the patient created by the authenticated user
-        return Patient.objects.filter(created_by=self.request.user)
\ No newline at end of file
+        return Patient.objects.filter(created_by=self.request.user)
+
+class PatientBulkCreateView(BulkCreateAPIView):
+    """Create many patients at once from a JSON array or NDJSON stream"""
+    serializer_class = PatientBulkSerializer
+    permission_classes = [IsAuthenticated]
+    unique_fields = ('email',)
+
+    def get_instance_kwargs(self):
+        # Same ownership rule as PatientListCreateView.perform_create
+        return {'created_by': self.request.user}
+
+class PatientExportView(StreamingExportView):
+    """Stream the user's patients as NDJSON or CSV"""
+    permission_classes = [IsAuthenticated]
+    export_name = 'patients'
+    export_fields = (
+        ('id', 'id'), ('name', 'name'), ('email', 'email'), ('phone', 'phone'),
+        ('date_of_birth', 'date_of_birth'), ('address', 'address'), ('gender', 'gender'),
+        ('blood_group', 'blood_group'), ('emergency_contact', 'emergency_contact'),
+        ('medical_history', 'medical_history'), ('active_doctor_count', 'active_doctor_count'),
+        ('created_by', 'created_by__email'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    )
+
+    def get_queryset(self):
+        # Walks patient_owner_created_idx in order, so no sort step is needed
+        return Patient.objects.filter(created_by=self.request.user).order_by('-created_at', '-id')
+
+class PatientSearchView(SearchListView):
+    """The user's patients ranked by how well name, email and phone match `?q=`"""
+    serializer_class = PatientSerializer
+    fast_serializer_class = PatientFastSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Patient.objects.filter(created_by=self.request.user)
+
+class PatientAsyncListView(AsyncListView):
+    """Async twin of the patient list (GET only)"""
+    fast_serializer_class = PatientFastSerializer
+
+    def get_queryset(self, user):
+        return Patient.objects.filter(created_by=user)
+
+class PatientAsyncDetailView(AsyncDetailView):
+    fast_serializer_class = PatientFastSerializer
+
+    def get_queryset(self, user):
+        return Patient.objects.filter(created_by=user)
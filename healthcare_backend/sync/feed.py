@@ -0,0 +1,153 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from patients.models import Patient
+from patients.serializers import PatientFastSerializer
+from doctors.models import Doctor
+from doctors.serializers import DoctorFastSerializer
+from mappings.models import PatientDoctorMapping
+from mappings.serializers import PatientDoctorMappingFastSerializer
+from .models import Tombstone
+
+STREAMS = ('patients', 'doctors', 'mappings')
+# Cursor key of the tombstone stream
+DELETED = 'deleted'
+# Cursor key of the page positions of streams that have more rows
+PAGES = 'pages'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class ExpiredCursor(Exception):
+    """The cursor predates the oldest tombstones kept; only a full sync is safe"""
+
+
+def stream_sources(user):
+    """{stream: (queryset, fast serializer)} of the rows `user` syncs"""
+    return {
+        'patients': (Patient.objects.filter(created_by=user), PatientFastSerializer),
+        'doctors': (Doctor.objects.all(), DoctorFastSerializer),
+        # created_by is the patient's owner (checked on assignment), and indexed with updated_at.
+        # Soft-deleted mappings reach clients as tombstones instead
+        'mappings': (
+            PatientDoctorMapping.objects.filter(created_by=user, is_active=True),
+            PatientDoctorMappingFastSerializer,
+        ),
+    }
+
+
+def encode_cursor(positions, pages=None):
+    data = {name: [when.isoformat(), pk] for name, (when, pk) in positions.items()}
+    data[PAGES] = {name: [when.isoformat(), pk] for name, (when, pk) in (pages or {}).items()}
+    raw = json.dumps(data, separators=(',', ':'), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """({stream: (datetime, id)}, {stream: page position}) from an opaque cursor; raises InvalidCursor"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+        positions = {
+            name: (datetime.fromisoformat(data[name][0]), int(data[name][1]))
+            for name in (*STREAMS, DELETED)
+        }
+        pages = {
+            name: (datetime.fromisoformat(when), int(pk))
+            for name, (when, pk) in data.get(PAGES, {}).items() if name in positions
+        }
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError, AttributeError):
+        raise InvalidCursor('Malformed sync cursor.')
+    if any(timezone.is_naive(when) for when, _ in (*positions.values(), *pages.values())):
+        raise InvalidCursor('Malformed sync cursor.')
+    return positions, pages
+
+
+def after(queryset, field, position):
+    """Rows past `position` in (field, id) order"""
+    if position is not None:
+        when, pk = position
+        queryset = queryset.filter(Q(**{f'{field}__gt': when}) | Q(**{field: when, 'pk__gt': pk}))
+    return queryset.order_by(field, 'pk')
+
+
+def next_position(position, last, truncated, horizon):
+    """Where the stream resumes once caught up, and where its next page starts if it has one.
+
+    A row's updated_at is stamped before its transaction commits, so a row
+    may become visible after later-stamped ones were synced. Holding the
+    resume position back by SYNC_SAFETY_WINDOW re-sends recent rows (clients
+    apply them idempotently) instead of skipping late commits. Continuation
+    pages start right after the last row sent, so a burst of changes inside
+    the window is paged through rather than served again from the horizon.
+    """
+    resume = min(last, horizon) if truncated else horizon
+    resume = resume if position is None else max(position, resume)
+    return resume, last if truncated else None
+
+
+def build_feed(user, positions=None, pages=None, limit=None):
+    """Changes and deletions visible to `user` since `positions` (None for a full sync).
+
+    Each stream is keyset-paginated on (updated_at, id), or (deleted_at, id)
+    for tombstones, up to `limit` rows, continuing from `pages` for streams
+    the previous call left unfinished; `has_more` says another call is needed.
+    """
+    pages = pages or {}
+    limit = limit or settings.SYNC_PAGE_SIZE
+    now = timezone.now()
+    if positions is not None:
+        oldest_kept = now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if positions[DELETED][0] < oldest_kept:
+            raise ExpiredCursor('Sync cursor has expired; start over with a full sync.')
+    horizon = (now - timedelta(seconds=settings.SYNC_SAFETY_WINDOW), 0)
+
+    changes, cursor, next_pages, has_more = {}, {}, {}, False
+    for name, (queryset, fast) in stream_sources(user).items():
+        position = positions[name] if positions else None
+        lookups = fast.get_lookups()
+        lookups += [field for field in ('id', 'updated_at') if field not in lookups]
+        start = pages.get(name, position)
+        rows = list(after(queryset, 'updated_at', start).values(*lookups)[:limit + 1])
+        truncated = len(rows) > limit
+        rows = rows[:limit]
+        last = (rows[-1]['updated_at'], rows[-1]['id']) if rows else None
+        cursor[name], next_pages[name] = next_position(position, last, truncated, horizon)
+        has_more = has_more or truncated
+        changes[name] = (rows, fast)
+
+    deleted = {name: [] for name in STREAMS}
+    if positions is None:
+        # A full sync has nothing to delete; deletions count from here on
+        cursor[DELETED] = horizon
+    else:
+        tombstones = Tombstone.objects.filter(Q(owner=user) | Q(owner__isnull=True))
+        rows = list(
+            after(tombstones, 'deleted_at', pages.get(DELETED, positions[DELETED]))
+            .values('id', 'stream', 'object_id', 'deleted_at')[:limit + 1]
+        )
+        truncated = len(rows) > limit
+        rows = rows[:limit]
+        last = (rows[-1]['deleted_at'], rows[-1]['id']) if rows else None
+        cursor[DELETED], next_pages[DELETED] = next_position(positions[DELETED], last, truncated, horizon)
+        has_more = has_more or truncated
+        for name in STREAMS:
+            # A mapping reassigned after its deletion is live again; drop the stale tombstone
+            live = {row['id']: row['updated_at'] for row in changes[name][0]}
+            deleted[name] = list(dict.fromkeys(
+                row['object_id'] for row in rows
+                if row['stream'] == name
+                and not (row['object_id'] in live and live[row['object_id']] > row['deleted_at'])
+            ))
+
+    return {
+        'cursor': encode_cursor(cursor, {name: page for name, page in next_pages.items() if page}),
+        'has_more': has_more,
+        'changes': {name: fast.serialize(rows) for name, (rows, fast) in changes.items()},
+        'deleted': deleted,
+    }
@@ -0,0 +1,39 @@
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+class Tombstone(models.Model):
+    """A deleted (or soft-deleted) row, kept so delta-sync clients learn to drop their copy"""
+    STREAMS = [
+        ('patients', 'Patients'),
+        ('doctors', 'Doctors'),
+        ('mappings', 'Mappings'),
+    ]
+
+    stream = models.CharField(max_length=20, choices=STREAMS)
+    object_id = models.BigIntegerField()
+    # Whose clients need to hear about it; NULL for rows every user sees (doctors).
+    # No FK constraint: a user's own cascade delete writes tombstones owned by them
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True, blank=True,
+        related_name='+'
+    )
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # The feed reads one owner's tombstones (plus the shared ones) keyset on (deleted_at, id)
+            models.Index(fields=['owner', 'deleted_at', 'id'], name='tombstone_owner_idx'),
+            # Pruning deletes by age across owners
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.stream} #{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+    @classmethod
+    def record(cls, stream, object_id, owner_id=None):
+        return cls.objects.create(stream=stream, object_id=object_id, owner_id=owner_id)
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from patients.models import Patient
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Patient)
+def record_patient_deletion(sender, instance, **kwargs):
+    Tombstone.record('patients', instance.pk, instance.created_by_id)
+
+
+@receiver(post_delete, sender=Doctor)
+def record_doctor_deletion(sender, instance, **kwargs):
+    Tombstone.record('doctors', instance.pk)
+
+
+@receiver(pre_delete, sender=Patient)
+@receiver(pre_delete, sender=Doctor)
+def record_cascaded_mapping_deletions(sender, instance, **kwargs):
+    """Active mappings the patient's or doctor's cascade is about to remove.
+
+    Recorded here rather than per mapping in post_delete, which would stop
+    Django from fast-deleting the cascade. Soft-deleted mappings got their
+    tombstone from deactivate_mapping().
+    """
+    foreign_key = 'patient' if sender is Patient else 'doctor'
+    mappings = PatientDoctorMapping.objects.filter(is_active=True, **{foreign_key: instance})
+    Tombstone.objects.bulk_create([
+        Tombstone(stream='mappings', object_id=pk, owner_id=owner_id)
+        for pk, owner_id in mappings.values_list('pk', 'created_by_id')
+    ])
@@ -0,0 +1,142 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from users.models import User
+from patients.models import Patient
+from patients.tests import create_patient
+from doctors.models import Doctor
+from doctors.tests import create_doctor
+from mappings.models import PatientDoctorMapping
+from .feed import decode_cursor, encode_cursor
+from .models import Tombstone
+
+
+@override_settings(SYNC_SAFETY_WINDOW=0)
+class SyncFeedTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='Secure@123'
+        )
+        self.patient = create_patient(self.user, 0)
+        self.doctor = create_doctor(0)
+        create_patient(self.other, 1)
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse('mapping-list-create'), {'patient': self.patient.pk, 'doctor': self.doctor.pk})
+        self.mapping = PatientDoctorMapping.objects.get()
+
+    def sync(self, cursor=None):
+        response = self.client.get(reverse('sync'), {'since': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def ids(self, feed, stream):
+        return [row['id'] for row in feed['changes'][stream]]
+
+    def test_full_sync_returns_visible_rows(self):
+        feed = self.sync()
+        self.assertEqual(self.ids(feed, 'patients'), [self.patient.pk])
+        self.assertEqual(self.ids(feed, 'doctors'), [self.doctor.pk])
+        self.assertEqual(self.ids(feed, 'mappings'), [self.mapping.pk])
+        self.assertEqual(feed['deleted'], {'patients': [], 'doctors': [], 'mappings': []})
+        self.assertFalse(feed['has_more'])
+
+    def test_delta_returns_only_changes_since_cursor(self):
+        cursor = self.sync()['cursor']
+        feed = self.sync(cursor)
+        self.assertEqual(feed['changes'], {'patients': [], 'doctors': [], 'mappings': []})
+
+        self.client.patch(reverse('patient-detail', args=[self.patient.pk]), {'name': 'Renamed'})
+        feed = self.sync(feed['cursor'])
+        self.assertEqual(self.ids(feed, 'patients'), [self.patient.pk])
+        self.assertEqual(feed['changes']['patients'][0]['name'], 'Renamed')
+        self.assertEqual(self.ids(feed, 'doctors'), [])
+
+    def test_soft_and_hard_deletes_are_reported(self):
+        cursor = self.sync()['cursor']
+        self.client.delete(reverse('mapping-detail', args=[self.mapping.pk]))
+        feed = self.sync(cursor)
+        self.assertEqual(feed['deleted']['mappings'], [self.mapping.pk])
+        self.assertEqual(self.ids(feed, 'mappings'), [])
+
+        self.client.delete(reverse('doctor-detail', args=[self.doctor.pk]))
+        self.client.delete(reverse('patient-detail', args=[self.patient.pk]))
+        feed = self.sync(feed['cursor'])
+        self.assertEqual(feed['deleted']['doctors'], [self.doctor.pk])
+        self.assertEqual(feed['deleted']['patients'], [self.patient.pk])
+        # Already reported by the soft delete
+        self.assertEqual(feed['deleted']['mappings'], [])
+
+    def test_cascaded_mapping_deletes_are_reported(self):
+        cursor = self.sync()['cursor']
+        self.client.delete(reverse('patient-detail', args=[self.patient.pk]))
+        feed = self.sync(cursor)
+        self.assertEqual(feed['deleted']['patients'], [self.patient.pk])
+        self.assertEqual(feed['deleted']['mappings'], [self.mapping.pk])
+        self.assertFalse(PatientDoctorMapping.objects.exists())
+
+    def test_reassignment_supersedes_tombstone(self):
+        cursor = self.sync()['cursor']
+        self.client.delete(reverse('mapping-detail', args=[self.mapping.pk]))
+        self.client.post(reverse('mapping-list-create'), {'patient': self.patient.pk, 'doctor': self.doctor.pk})
+        feed = self.sync(cursor)
+        self.assertEqual(self.ids(feed, 'mappings'), [self.mapping.pk])
+        self.assertEqual(feed['deleted']['mappings'], [])
+
+    def test_other_users_deletions_are_hidden(self):
+        cursor = self.sync()['cursor']
+        Patient.objects.filter(created_by=self.other).delete()
+        feed = self.sync(cursor)
+        self.assertEqual(feed['deleted']['patients'], [])
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_streams_are_paginated(self):
+        for i in range(1, 4):
+            create_doctor(i)
+        first = self.sync()
+        self.assertTrue(first['has_more'])
+        self.assertEqual(len(first['changes']['doctors']), 2)
+        second = self.sync(first['cursor'])
+        self.assertFalse(second['has_more'])
+        seen = self.ids(first, 'doctors') + self.ids(second, 'doctors')
+        self.assertEqual(sorted(seen), sorted(Doctor.objects.values_list('pk', flat=True)))
+
+    @override_settings(SYNC_PAGE_SIZE=2, SYNC_SAFETY_WINDOW=60)
+    def test_burst_inside_safety_window_is_paged_through(self):
+        for i in range(1, 6):
+            create_doctor(i)
+        pages, cursor = [], None
+        for _ in range(3):
+            feed = self.sync(cursor)
+            pages.append(self.ids(feed, 'doctors'))
+            cursor = feed['cursor']
+            if not feed['has_more']:
+                break
+        self.assertFalse(feed['has_more'])
+        seen = [pk for page in pages for pk in page]
+        self.assertEqual(sorted(seen), sorted(Doctor.objects.values_list('pk', flat=True)))
+        # Caught up, the next poll restarts from the held-back horizon and re-sends the burst
+        self.assertEqual(self.ids(self.sync(cursor), 'doctors'), pages[0])
+
+    def test_bad_and_expired_cursors(self):
+        response = self.client.get(reverse('sync'), {'since': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+        positions, pages = decode_cursor(self.sync()['cursor'])
+        positions['deleted'] = (timezone.now() - timedelta(days=365), 0)
+        response = self.client.get(reverse('sync'), {'since': encode_cursor(positions, pages)})
+        self.assertEqual(response.status_code, 410)
+
+    def test_prune_tombstones(self):
+        Tombstone.record('doctors', 1)
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=60))
+        Tombstone.record('doctors', 2)
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [2])
@@ -0,0 +1,32 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .feed import ExpiredCursor, InvalidCursor, build_feed, decode_cursor
+
+class SyncView(generics.GenericAPIView):
+    """Delta-sync feed: rows changed and deleted since the `since` cursor.
+
+    Reads always go to the primary: a lagging replica could hide rows that
+    the returned cursor has already moved past.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter(
+            'since', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+            description='Cursor from the previous response; omit for a full sync',
+        )],
+        responses={200: 'Changed rows, deleted ids and the next cursor', 410: 'Cursor expired'},
+    )
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get('since')
+        try:
+            positions, pages = decode_cursor(since) if since else (None, None)
+            feed = build_feed(request.user, positions, pages)
+        except InvalidCursor as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except ExpiredCursor as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_410_GONE)
+        return Response(feed)
@@ -0,0 +1,66 @@
+from asgiref.sync import sync_to_async
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+from .tokens import USER_CLAIMS
+from . import revocation
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that builds request.user from the token's claims.
+
+    The user is a real `User` instance holding the id, USER_CLAIMS and
+    is_active; every other field is deferred and only loaded from the
+    database if a view reads it. Deactivated and deleted users are rejected through the
+    in-process revocation set. Tokens issued without the claims fall back to
+    the usual per-request lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not self.has_claims(validated_token):
+            return super().get_user(validated_token)
+        user_id = self.get_user_id(validated_token)
+        if revocation.is_revoked(user_id):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return self.user_from_claims(user_id, validated_token)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views; takes a plain Django request"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        # Decoding and verifying the token is pure CPU work
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if not self.has_claims(validated_token):
+            return await sync_to_async(super().get_user)(validated_token)
+        user_id = self.get_user_id(validated_token)
+        if user_id in await revocation.aget_revoked_user_ids():
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return self.user_from_claims(user_id, validated_token)
+
+    def has_claims(self, validated_token):
+        return all(claim in validated_token for claim in USER_CLAIMS)
+
+    def get_user_id(self, validated_token):
+        try:
+            return User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def user_from_claims(self, user_id, validated_token):
+        values = {'id': user_id, 'is_active': True}
+        values.update((claim, validated_token[claim]) for claim in USER_CLAIMS)
+        # from_db() takes the loaded fields in model order and defers the rest
+        field_names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+        return User.from_db(
+            router.db_for_read(User), field_names, [values[name] for name in field_names]
+        )
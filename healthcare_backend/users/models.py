@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
 class User(AbstractUser):
@@ -22,4 +23,13 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.email
-    
\ No newline at end of file
+    
+
+class DeletedUser(models.Model):
+    """A deleted account whose unexpired JWTs every process must keep rejecting"""
+    # Not a foreign key: the user row is gone
+    user_id = models.BigIntegerField(unique=True)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"User #{self.user_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,66 @@
+import threading
+import time
+from django.conf import settings
+from django.utils import timezone
+from .models import DeletedUser, User
+
+_lock = threading.Lock()
+_revoked = frozenset()
+_expires_at = 0.0
+
+
+def _revoked_queries():
+    # Deleted users no longer match is_active=False; their DeletedUser rows stand in until
+    # every refresh token issued to them has expired
+    cutoff = timezone.now() - settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME']
+    return (
+        User.objects.filter(is_active=False).values_list('id', flat=True),
+        DeletedUser.objects.filter(deleted_at__gte=cutoff).values_list('user_id', flat=True),
+    )
+
+
+def _store(ids):
+    global _revoked, _expires_at
+    with _lock:
+        _revoked = frozenset(ids)
+        _expires_at = time.monotonic() + settings.JWT_REVOCATION_TTL
+
+
+def get_revoked_user_ids():
+    """Return the IDs of deactivated and deleted users, reloaded at most once per JWT_REVOCATION_TTL.
+
+    The set lives in process memory so authenticating a request needs no query;
+    other processes pick up a deactivation or deletion within one TTL.
+    """
+    if time.monotonic() >= _expires_at:
+        _store([user_id for query in _revoked_queries() for user_id in query])
+    return _revoked
+
+
+async def aget_revoked_user_ids():
+    if time.monotonic() >= _expires_at:
+        _store([user_id for query in _revoked_queries() async for user_id in query])
+    return _revoked
+
+
+def is_revoked(user_id):
+    return user_id in get_revoked_user_ids()
+
+
+def revoke(user_id):
+    """Reject the user's tokens in this process straight away"""
+    global _revoked
+    with _lock:
+        _revoked = _revoked | {user_id}
+
+
+def restore(user_id):
+    global _revoked
+    with _lock:
+        _revoked = _revoked - {user_id}
+
+
+def expire():
+    """Force a reload on the next lookup"""
+    global _expires_at
+    _expires_at = 0.0
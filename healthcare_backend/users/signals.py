@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import DeletedUser, User
+from . import revocation
+
+
+@receiver(post_save, sender=User)
+def update_revoked_users(sender, instance, **kwargs):
+    if instance.is_active:
+        revocation.restore(instance.pk)
+    else:
+        revocation.revoke(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    # Recorded in the database so other processes reject the user's tokens on their next reload
+    DeletedUser.objects.update_or_create(user_id=instance.pk)
+    revocation.revoke(instance.pk)
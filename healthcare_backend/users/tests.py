@@ -1,3 +1,146 @@
-from django.test import TestCase
+import importlib
+from types import SimpleNamespace
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from .authentication import ClaimsJWTAuthentication
+from .models import User
+from .throttling import EmailRateThrottle
+from . import revocation
 
-# Create your tests here.
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='owner', email='owner@example.com', password='Secure@123', role='doctor'
+        )
+        revocation.expire()
+
+    def login(self):
+        response = self.client.post(
+            reverse('user_login'), {'email': 'OWNER@example.com', 'password': 'Secure@123'}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data['access']
+
+    def test_access_token_carries_user_claims(self):
+        token = AccessToken(self.login())
+        self.assertEqual(token['email'], 'owner@example.com')
+        self.assertEqual(token['role'], 'doctor')
+
+    def test_requests_skip_the_user_lookup(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.login()}')
+        url = reverse('patient-list-create')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertFalse(
+            [query for query in ctx.captured_queries if 'FROM "users_user"' in query['sql']]
+        )
+
+    def test_user_is_lazy_model_instance(self):
+        token = AccessToken(self.login())
+        with self.assertNumQueries(2):
+            # The first lookup loads the revocation set (deactivated, then deleted users)
+            user = ClaimsJWTAuthentication().get_user(token)
+        with self.assertNumQueries(0):
+            self.assertEqual(user, self.user)
+            self.assertEqual((user.email, user.role), ('owner@example.com', 'doctor'))
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, 'owner')
+
+    def test_deactivated_user_is_rejected(self):
+        token = AccessToken(self.login())
+        ClaimsJWTAuthentication().get_user(token)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            ClaimsJWTAuthentication().get_user(token)
+        # Still rejected once the set is reloaded from the database
+        revocation.expire()
+        with self.assertRaises(AuthenticationFailed):
+            ClaimsJWTAuthentication().get_user(token)
+
+    def test_deleted_user_is_rejected_by_other_processes(self):
+        token = AccessToken(self.login())
+        ClaimsJWTAuthentication().get_user(token)
+        self.user.delete()
+        # A fresh worker never saw the delete signal and builds its set from the database
+        importlib.reload(revocation)
+        with self.assertRaises(AuthenticationFailed):
+            ClaimsJWTAuthentication().get_user(token)
+
+    def test_tokens_without_claims_fall_back_to_database(self):
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(self.client.get(reverse('patient-list-create')).status_code, 200)
+
+
+THROTTLED = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {
+    'login_ip': '10/min', 'login_email': '2/min', 'register_ip': '2/min', 'register_email': '5/min',
+}}
+
+
+@override_settings(REST_FRAMEWORK=THROTTLED)
+class AuthThrottleTests(APITestCase):
+
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE].clear()
+        User.objects.create_user(username='owner', email='owner@example.com', password='Secure@123')
+
+    def login(self, email, **extra):
+        return self.client.post(reverse('user_login'), {'email': email, 'password': 'wrong'}, **extra)
+
+    def test_login_is_limited_per_email_before_hashing(self):
+        for _ in range(2):
+            self.assertEqual(self.login('owner@example.com').status_code, 401)
+        # A throttled attempt never reaches authenticate(): no user lookup, no password hash
+        with self.assertNumQueries(0):
+            response = self.login(' OWNER@example.com', REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.login('other@example.com').status_code, 401)
+
+    def test_registration_is_limited_per_ip(self):
+        url = reverse('register')
+        for index in range(3):
+            response = self.client.post(url, {
+                'username': f'new{index}', 'email': f'new{index}@example.com', 'password': 'Secure@123',
+                'phone': f'987654321{index}', 'role': 'patient',
+            })
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(User.objects.filter(username__startswith='new').count(), 2)
+
+    def test_spoofed_forwarded_for_does_not_reset_ip_limit(self):
+        url = reverse('register')
+        for index in range(3):
+            response = self.client.post(url, {
+                'username': f'new{index}', 'email': f'new{index}@example.com', 'password': 'Secure@123',
+                'phone': f'987654321{index}', 'role': 'patient',
+            }, HTTP_X_FORWARDED_FOR=f'203.0.113.{index}')
+        self.assertEqual(response.status_code, 429)
+
+    def test_previous_window_decays(self):
+        throttle = EmailRateThrottle()
+        view = SimpleNamespace(throttle_scope='login')
+        request = SimpleNamespace(data={'email': 'owner@example.com'})
+        now = [600.0]
+        throttle.timer = lambda: now[0]
+        self.assertTrue(throttle.allow_request(request, view))
+        self.assertTrue(throttle.allow_request(request, view))
+        self.assertFalse(throttle.allow_request(request, view))
+        self.assertEqual(throttle.wait(), 60)
+        # A quarter into the next window the old two still weigh 1.5 of the 2 allowed
+        now[0] = 675.0
+        self.assertTrue(throttle.allow_request(request, view))
+        self.assertFalse(throttle.allow_request(request, view))
+        self.assertEqual(throttle.wait(), 15)
+        now[0] = 691.0
+        self.assertTrue(throttle.allow_request(request, view))
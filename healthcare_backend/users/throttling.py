@@ -0,0 +1,100 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Sliding-window counter throttle keyed on `<view.throttle_scope>_<scope_suffix>`.
+
+    Each window keeps a single counter; the request count is the current
+    window's counter plus the previous one weighted by how much of it still
+    overlaps the sliding window. Two integers per client instead of DRF's
+    timestamp history, and a plain `incr` works atomically on any shared
+    cache. Counters live in the THROTTLE_CACHE cache.
+    """
+    scope_suffix = None
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request()
+        pass
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE]
+
+    def get_rate(self):
+        # Read at call time so rate changes in settings apply without a restart
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_value(self, request):
+        raise NotImplementedError('.get_ident_value() must be overridden')
+
+    def get_cache_key(self, request, view):
+        value = self.get_ident_value(request)
+        if not value:
+            return None
+        # Hashed so any client-supplied value makes a short, safe cache key
+        ident = hashlib.sha256(value.encode()).hexdigest()[:32]
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+        self.scope = f'{scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        self.elapsed = offset / self.duration
+        self.window_key = f'{self.key}:{int(window)}'
+        counts = self.cache.get_many([f'{self.key}:{int(window) - 1}', self.window_key])
+        self.previous = counts.get(f'{self.key}:{int(window) - 1}', 0)
+        self.current = counts.get(self.window_key, 0)
+        if self.previous * (1 - self.elapsed) + self.current >= self.num_requests:
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        # The counter must outlive the next window, which still reads it
+        if not self.cache.add(self.window_key, 1, 2 * self.duration):
+            try:
+                self.cache.incr(self.window_key)
+            except ValueError:
+                # Expired between add() and incr()
+                self.cache.set(self.window_key, 1, 2 * self.duration)
+        return True
+
+    def wait(self):
+        remaining = (1 - self.elapsed) * self.duration
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+        # Until the previous window's weight has decayed enough to admit one more request
+        overlap = (self.num_requests - self.current) / self.previous
+        return max(0.0, (1 - overlap - self.elapsed) * self.duration)
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Per client IP (honouring NUM_PROXIES for X-Forwarded-For)"""
+    scope_suffix = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    """Per submitted email address, however many IPs the attempts come from"""
+    scope_suffix = 'email'
+
+    def get_ident_value(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email.strip().lower() if isinstance(email, str) else None
@@ -3,11 +3,15 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate
 from rest_framework import serializers
+from .throttling import EmailRateThrottle, IPRateThrottle
+from .tokens import ClaimsRefreshToken
 
 User = get_user_model()
 
 # Custom serializer to include user information and handle case-insensitive email
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # Embed email and role so authentication can skip the user lookup
+    token_class = ClaimsRefreshToken
     
     def validate(self, attrs):
         # Convert email to lowercase for case-insensitive lookup
@@ -24,4 +28,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 # Custom view to use the custom serializer
 class CustomTokenObtainPairView(TokenObtainPairView):
-    serializer_class = CustomTokenObtainPairSerializer
\ No newline at end of file
+    serializer_class = CustomTokenObtainPairSerializer
+    # Checked before authenticate(), so throttled attempts cost no query and no hashing
+    throttle_classes = (IPRateThrottle, EmailRateThrottle)
+    throttle_scope = 'login'
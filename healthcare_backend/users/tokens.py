@@ -0,0 +1,15 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# User fields copied into every token, in addition to the user_id claim
+USER_CLAIMS = ('email', 'role')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token carrying USER_CLAIMS; access tokens derived from it copy them"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
@@ -3,12 +3,16 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from .models import User
 from .serializers import UserSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from .throttling import EmailRateThrottle, IPRateThrottle
+from .tokens import ClaimsRefreshToken
 
 class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (AllowAny,)
+    # Throttles run before validation, so rejected requests never reach the password hasher
+    throttle_classes = (IPRateThrottle, EmailRateThrottle)
+    throttle_scope = 'register'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -16,7 +20,7 @@ class UserRegistrationView(generics.CreateAPIView):
         user = serializer.save()
 
         # Generate JWT token for the new user
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         tokens = {
             'refresh': str(refresh),
             'access': str(refresh.access_token),